@@ -2,13 +2,34 @@
 from __future__ import annotations
 import os
 import json
-import sys
 from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+
+from .utils.helpers import base_dir_for_user_files
 
 # ========== Speed knobs / performance ==========
 MAX_WORKERS_FILES = 6          # параллельная обработка файлов
+MAX_WORKERS_JARS = 4           # параллельная обработка .jar (lang внутри модов)
+MAX_WORKERS_JAR_MEMBERS = 4    # lang-файлы внутри одного .jar параллельно
 BATCH_SIZE = 100               # размер пачки строк на 1 запрос
+BATCH_MAX_CHARS = 6000         # и не больше стольких символов текста в пачке
+MAX_WORKERS_BATCHES = 4        # пачки одного translate_many — параллельно
+# Пул httpx-соединений к API (если httpx установлен): файлы × пачки шлют
+# запросы одновременно; с HTTP/2 они мультиплексируются поверх меньшего числа
+HTTP_MAX_CONNECTIONS = 20
+# Склейка мелких translate_many от параллельных файлов в один вызов:
+# сбрасываем, как только набралось столько строк или прошло столько секунд.
+# 0 строк — склейка выключена.
+COALESCE_STRINGS = 128
+COALESCE_DELAY = 0.05
+# Мемо переводов в процессорах (processors/_tcache.py), записей
+PROCESSOR_MEMO_MAX = 65536
 CACHE_FALLBACKS = True         # использовать кэш переводов
+# Шаблонные ключи кэша в translate_many: namespaced ID маскируются («Use
+# minecraft:stone» и «Use minecraft:dirt» → один ключ «Use {__0}»). Меньше
+# запросов на паках с повторяющимися шаблонами; выключено по умолчанию.
+CACHE_TEMPLATE_KEYS = False
 RETRY_MAX_ATTEMPTS = 6
 RETRY_BASE_DELAY = 2.0
 RETRY_MAX_DELAY = 30.0
@@ -26,19 +47,34 @@ SCAN_JAR_LANG = True
 TARGET_LANG = os.environ.get("TARGET_LANG", "ru_ru")
 
 # Для промта нужно «человеческое» имя языка
-MC_LANG_NAMES = {
-    "ru_ru": "Russian",
-    "en_us": "English",
-    "de_de": "German",
-    "fr_fr": "French",
-    "es_es": "Spanish",
-    "pt_br": "Brazilian Portuguese",
-    "zh_cn": "Simplified Chinese",
-    "ja_jp": "Japanese",
-}
+_LANG_PAIRS: tuple[tuple[str, str], ...] = (
+    ("ru_ru", "Russian"),
+    ("en_us", "English"),
+    ("de_de", "German"),
+    ("fr_fr", "French"),
+    ("es_es", "Spanish"),
+    ("pt_br", "Brazilian Portuguese"),
+    ("zh_cn", "Simplified Chinese"),
+    ("ja_jp", "Japanese"),
+)
+# read-only представление: таблицу никто не мутирует, и кэш lang_name() не устареет
+MC_LANG_NAMES: MappingProxyType = MappingProxyType(dict(_LANG_PAIRS))
+
+# (код, подпись для выпадающего списка GUI) — считается один раз на импорте
+MC_LANG_CHOICES: tuple[tuple[str, str], ...] = tuple(
+    (code, f"{name} ({code})") for code, name in _LANG_PAIRS
+)
+
+
+@lru_cache(maxsize=32)
+def lang_name(code: str) -> str:
+    """ru_ru -> Russian; неизвестный код возвращается как есть. Мемоизировано."""
+    return MC_LANG_NAMES.get(code.lower(), code)
+
 
 def get_target_lang_name() -> str:
-    return MC_LANG_NAMES.get(TARGET_LANG.lower(), TARGET_LANG)
+    # TARGET_LANG меняется из GUI, поэтому код передаём явно — кэш не «залипает»
+    return lang_name(TARGET_LANG)
 
 # ========== Провайдер перевода ==========
 # (устаревшие поля — оставлены для обратной совместимости; актуальная
@@ -46,7 +82,7 @@ def get_target_lang_name() -> str:
 TRANSLATOR_PROVIDER = os.environ.get("TRANSLATOR_PROVIDER", "openai")  # legacy
 TRANSLATOR_MODEL = os.environ.get("TRANSLATOR_MODEL", "gpt-4o-mini")
 
-OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY", "")
+# OPENAI_API_KEY резолвится лениво (см. __getattr__ ниже): ENV → secrets.json.
 # Закрывает R-4 / Q-1: base_url теперь конфигурируем (OpenAI, DeepSeek, Qwen,
 # llama.cpp server, LM Studio, Ollama /v1, vLLM ...).
 OPENAI_BASE_URL = os.environ.get("OPENAI_BASE_URL", "https://api.openai.com")
@@ -61,23 +97,33 @@ LOCAL_MODEL_LABEL = os.environ.get("LOCAL_MODEL_LABEL", "local-gguf")
 TRANSLATOR_MODE = os.environ.get("TRANSLATOR_MODE", "local")
 
 # ===== Загрузка ключа из secrets.json (если есть) =====
-def _base_dir_for_user_files() -> str:
-    if getattr(sys, "frozen", False):
-        return os.path.dirname(sys.executable)
-    return os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-
-BASE_DIR = _base_dir_for_user_files()
+BASE_DIR = base_dir_for_user_files()
 SECRETS_PATH = os.path.join(BASE_DIR, "secrets.json")
 
-try:
-    if os.path.exists(SECRETS_PATH):
-        with open(SECRETS_PATH, "r", encoding="utf-8") as _sf:
-            _secrets = json.load(_sf)
-            if not OPENAI_API_KEY:
-                OPENAI_API_KEY = _secrets.get("OPENAI_API_KEY", OPENAI_API_KEY)
-except Exception:
-    # Если секреты не прочитались — тихо игнорируем
-    pass
+
+@lru_cache(maxsize=1)
+def _load_secrets() -> dict:
+    """secrets.json читается один раз за процесс и только по требованию."""
+    try:
+        with open(SECRETS_PATH, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except Exception:
+        # Если секреты не прочитались — тихо игнорируем
+        return {}
+
+
+def get_openai_api_key() -> str:
+    return os.environ.get("OPENAI_API_KEY") or _load_secrets().get("OPENAI_API_KEY", "")
+
+
+def __getattr__(name: str):
+    # PEP 562: config.OPENAI_API_KEY без json.load на импорте. Явное
+    # присваивание config.OPENAI_API_KEY = ... (GUI → «Задать ключ») создаёт
+    # обычный атрибут модуля и дальше сюда уже не попадает.
+    if name == "OPENAI_API_KEY":
+        return get_openai_api_key()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # ========== Конфигурация провайдера (A-1) ==========
@@ -118,14 +164,15 @@ class ProviderConfig:
     prompt_cache: bool = True
 
 
-# Экземпляр по умолчанию: режим "local", ключ/URL подтягиваются из env/secrets.
+# Экземпляр по умолчанию: режим "local", URL подтягиваются из env. Ключ здесь
+# только из ENV; secrets.json подхватывают GUI / factory через OPENAI_API_KEY.
 PROVIDER = ProviderConfig(
     mode=TRANSLATOR_MODE,
     local_model_path=LOCAL_MODEL_PATH,
     local_server_url=LOCAL_SERVER_URL,
     local_model=LOCAL_MODEL_LABEL,
     external_base_url=OPENAI_BASE_URL,
-    external_api_key=OPENAI_API_KEY,
+    external_api_key=os.environ.get("OPENAI_API_KEY", ""),
     external_model=TRANSLATOR_MODEL,
 )
 
@@ -138,6 +185,10 @@ APP_DATA_DIR = os.environ.get("MC_TRANSLATOR_HOME") or os.path.join(
 )
 MODELS_DIR = os.path.join(APP_DATA_DIR, "models")
 HARDWARE_CACHE_PATH = os.path.join(APP_DATA_DIR, "hardware.json")
+# Готовые переводы lang-файлов из .jar по хэшу содержимого (между модпаками
+# одни и те же моды); False — не использовать.
+JAR_LANG_FILE_CACHE = True
+JAR_LANG_CACHE_DIR = os.path.join(APP_DATA_DIR, "jar_lang_cache")
 
 
 def ensure_app_dirs() -> None:
@@ -151,16 +202,22 @@ DEFAULT_CACHE_PATH = os.environ.get("TRANSLATIONS_CACHE", "translations_cache.js
 # ========== Эвристики ==========
 SAFE_MAX_LEN = 800                   # максимум длины строки, которую считаем «текстом»
 RATE_LIMIT_SLEEP = 0.4
+# Строки, перегруженные токенами, модель чаще ломает, чем переводит (запрос
+# впустую, потом фоллбек) — оставляем как есть без запроса: токенов больше
+# TOKEN_MAX_COUNT или доля плейсхолдеров в длине больше TOKEN_MAX_MASS.
+# 0 — проверка выключена.
+TOKEN_MAX_COUNT = 8
+TOKEN_MAX_MASS = 0.6
 INCLUDE_KUBEJS_JS = os.environ.get("INCLUDE_KUBEJS_JS", "0") == "1"
 
 # Ключи текста в FTB Quests .snbt
-FTB_TEXT_KEYS = {
+FTB_TEXT_KEYS: frozenset[str] = frozenset({
     "title", "subtitle", "description", "text", "message",
     "chapter", "task", "hint", "note", "body", "book_text", "page_text"
-}
+})
 
 # Ключи текста для «общих» JSON (tips, patchouli и пр.)
-GENERIC_TEXT_KEYS = {
+GENERIC_TEXT_KEYS: frozenset[str] = frozenset({
     "title", "name", "subtitle", "text", "message", "description",
     "tooltip", "note", "hint", "summary", "landing_text", "contents"
-}
+})
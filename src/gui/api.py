@@ -3,16 +3,17 @@ from __future__ import annotations
 
 import json
 import os
-import sys
 import threading
 import time
 import traceback
+from dataclasses import astuple
 from typing import Any, Dict, List, Optional
 
 # --- бэкенд (НЕ модифицируется; вызывается через модульные атрибуты, чтобы
 #     тесты могли их мокать: mirrorer.mirror_translate_dir и т.п.) ---
 from .. import config
 from ..utils.cache import TranslationCache
+from ..utils.helpers import atomic_write_text
 from ..translators import Translator
 from .. import mirrorer
 from ..llm import factory
@@ -68,13 +69,6 @@ class _Control:
                 raise _StopRequested()
 
 
-def _base_dir_for_user_files() -> str:
-    if getattr(sys, "frozen", False):
-        return os.path.dirname(sys.executable)
-    # src/gui/api.py → корень проекта на два уровня выше src/
-    return os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
-
-
 class Api:
     """
     Мост pywebview ↔ Python. Экземпляр прокидывается в JS как
@@ -94,6 +88,10 @@ class Api:
         self._dl_thread: Optional[threading.Thread] = None
         self._dl_cancel: Optional[threading.Event] = None  # отмена активной загрузки
         self._start_time = 0.0
+        # переиспользуемые между запусками кэш/переводчик (см. _get_translator)
+        self._cache: Optional[TranslationCache] = None
+        self._translator: Optional[Translator] = None
+        self._translator_key: Optional[tuple] = None
 
         hw = hp.load_cached()
         # Активный тир при старте — ВСЕГДА текущий PROVIDER.tier (по умолчанию
@@ -329,10 +327,10 @@ class Api:
             self._set(message="Ключ пустой.")
             return self._snapshot()
         try:
-            base_dir = _base_dir_for_user_files()
-            os.makedirs(base_dir, exist_ok=True)
-            with open(os.path.join(base_dir, "secrets.json"), "w", encoding="utf-8") as f:
-                json.dump({"OPENAI_API_KEY": key}, f, ensure_ascii=False, indent=2)
+            atomic_write_text(
+                config.SECRETS_PATH,
+                json.dumps({"OPENAI_API_KEY": key}, ensure_ascii=False),
+            )
         except Exception as e:
             self._set(message=f"Не удалось сохранить ключ: {e}")
             return self._snapshot()
@@ -531,15 +529,32 @@ class Api:
         # кооперативные пауза/стоп на границе файла
         self._control.checkpoint()
 
+    def _get_translator(self, cfg) -> Translator:
+        """
+        Кэш и переводчик переиспользуются между запусками: кэш перечитывается с
+        диска только при смене пути, клиенты (в т.ч. загруженная GGUF-модель)
+        пересобираются только при смене провайдера/модели/ключа.
+        """
+        cache_path = config.DEFAULT_CACHE_PATH
+        if self._cache is None or self._cache.path != cache_path:
+            self._cache = TranslationCache(cache_path)
+            self._translator = None
+        key = (astuple(cfg), cache_path)
+        if self._translator is None or self._translator_key != key:
+            primary, complex_client = factory.build_clients(cfg)
+            self._translator = Translator(
+                primary, self._cache, strict=True, complex_client=complex_client, log=self._log
+            )
+            self._translator_key = key
+        return self._translator
+
     def _run_translation(self, inp: str, out: str, write: bool):
         try:
-            cache = TranslationCache(config.DEFAULT_CACHE_PATH)
             cfg = config.PROVIDER
             cfg.mode = self._state["mode"]
             cfg.external_api_key = config.OPENAI_API_KEY
             cfg.tier = self._state["tier"]
-            primary, complex_client = factory.build_clients(cfg)
-            tr = Translator(primary, cache, strict=True, complex_client=complex_client, log=self._log)
+            tr = self._get_translator(cfg)
 
             mirrorer.mirror_translate_dir(
                 inp, out, tr,
@@ -13,26 +13,32 @@ if __name__ == "__main__" and (__package__ is None or __package__ == ""):
     __package__ = "src"
 # -------------------------
 
+import queue
+import subprocess
 import threading
 import time
+from collections import deque
+from dataclasses import astuple
+from functools import cached_property
+from concurrent.futures import Future
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import json
 
-from src.translators import Translator
-from src.utils.cache import TranslationCache
 from src import config
-from src.llm import build_clients
+from src.utils.helpers import atomic_write_text
 from src.llm import hardware_probe as hp
 from src.llm import model_downloader as dl
 from src.llm import model_registry as registry
-from src.mirrorer import mirror_translate_dir
+# Translator / TranslationCache / mirror_translate_dir / build_clients
+# импортируются лениво в _run_job: окно рисуется сразу, без загрузки
+# всего стека перевода (processors, snbt-парсер, HTTP-клиенты).
 
 
-def _base_dir_for_user_files() -> str:
-    if getattr(sys, "frozen", False):
-        return os.path.dirname(sys.executable)
-    return os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+# период слива очереди тиков/лога в UI (~10 Гц)
+TICK_DRAIN_MS = 100
+# сколько последних строк лога держим (и в очереди, и в виджете)
+LOG_TAIL = 2000
 
 
 class App(tk.Tk):
@@ -61,19 +67,59 @@ class App(tk.Tk):
         self._dl_thread: threading.Thread | None = None
 
         self.key_ok = bool(config.OPENAI_API_KEY)
-        self._worker: threading.Thread | None = None
-
-        # прогресс
-        self.total_var = tk.IntVar(value=0)
-        self.done_var = tk.IntVar(value=0)
-        self.ok_var = tk.IntVar(value=0)
-        self.err_var = tk.IntVar(value=0)
-        self.skip_var = tk.IntVar(value=0)
-        self.speed_var = tk.StringVar(value="—")
-        self.eta_var = tk.StringVar(value="—")
+        # задание «Старт» — daemon-поток с Future (см. _submit_job)
+        self._future: Future | None = None
+        self._closing = threading.Event()  # окно закрыто — колбэки задания в UI не идут
+        # переиспользуемые между запусками кэш/переводчик (см. _run_job)
+        self._cache = None
+        self._translator = None
+        self._translator_key: tuple | None = None
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+
+        # прогресс: *_var — ленивые cached_property (см. ниже)
         self._start_time = 0.0
+        # тики прогресса из воркера копятся здесь и сливаются в UI раз в 100 мс
+        self._tick_queue: queue.SimpleQueue = queue.SimpleQueue()
+        # кольцевой буфер: при лавине строк между сливами старые просто выпадают
+        self._log_queue: deque = deque(maxlen=LOG_TAIL)
 
         self._build_ui()
+        self.after(TICK_DRAIN_MS, self._drain_ticks)
+        # окно уже нарисовано к первому idle — греем стек перевода в фоне,
+        # чтобы первый «Старт» не платил за импорты (см. _run_job)
+        self.after_idle(
+            lambda: threading.Thread(target=self._warm_imports, name="warm-imports", daemon=True).start()
+        )
+
+    # ---------- переменные прогресса (создаются при первом обращении) ----------
+
+    @cached_property
+    def total_var(self) -> tk.IntVar:
+        return tk.IntVar(self, value=0)
+
+    @cached_property
+    def done_var(self) -> tk.IntVar:
+        return tk.IntVar(self, value=0)
+
+    @cached_property
+    def ok_var(self) -> tk.IntVar:
+        return tk.IntVar(self, value=0)
+
+    @cached_property
+    def err_var(self) -> tk.IntVar:
+        return tk.IntVar(self, value=0)
+
+    @cached_property
+    def skip_var(self) -> tk.IntVar:
+        return tk.IntVar(self, value=0)
+
+    @cached_property
+    def speed_var(self) -> tk.StringVar:
+        return tk.StringVar(self, value="—")
+
+    @cached_property
+    def eta_var(self) -> tk.StringVar:
+        return tk.StringVar(self, value="—")
 
     def _build_ui(self):
         pad = {"padx": 8, "pady": 6}
@@ -114,17 +160,10 @@ class App(tk.Tk):
 
         ttk.Label(lang_frame, text="Язык перевода (Minecraft locale):").pack(side="left")
 
-        # список языков из config.MC_LANG_NAMES, если есть
-        lang_codes = []
-        lang_display = []
-        mapping = getattr(config, "MC_LANG_NAMES", None)
-        if isinstance(mapping, dict) and mapping:
-            for code, name in mapping.items():
-                lang_codes.append(code)
-                lang_display.append(f"{name} ({code})")
-        else:
-            lang_codes = [self.lang_var.get()]
-            lang_display = [self.lang_var.get()]
+        # список языков: config.MC_LANG_CHOICES посчитан один раз на импорте
+        choices = config.MC_LANG_CHOICES or ((self.lang_var.get(), self.lang_var.get()),)
+        lang_codes = [code for code, _ in choices]
+        lang_display = [label for _, label in choices]
 
         self.lang_combo = ttk.Combobox(
             lang_frame,
@@ -265,7 +304,7 @@ class App(tk.Tk):
             try:
                 hw = hp.get_or_probe(force=True)
             except Exception as e:
-                self.after(0, self.log, f"❌ Проба железа не удалась: {e}")
+                self.log(f"❌ Проба железа не удалась: {e}")
                 return
 
             def apply():
@@ -376,7 +415,7 @@ class App(tk.Tk):
 
         def work():
             for spec in specs:
-                self.after(0, self.log, f"⬇️ Скачивание {spec.display} (~{spec.size_mb} MB)…")
+                self.log(f"⬇️ Скачивание {spec.display} (~{spec.size_mb} MB)…")
 
                 def prog(done, total, spec=spec):
                     def apply():
@@ -387,24 +426,23 @@ class App(tk.Tk):
 
                 try:
                     dl.download_model(spec, progress_cb=prog)
-                    self.after(0, self.log, f"✅ Скачано: {spec.display}")
+                    self.log(f"✅ Скачано: {spec.display}")
                 except dl.DownloadError as e:
-                    self.after(0, self.log, f"❌ Ошибка скачивания {spec.display}: {e}")
+                    self.log(f"❌ Ошибка скачивания {spec.display}: {e}")
                     self.after(0, lambda e=e: messagebox.showerror("Ошибка скачивания", str(e)))
                     return
                 except Exception as e:
-                    self.after(0, self.log, f"❌ Непредвиденная ошибка при скачивании: {e}")
+                    self.log(f"❌ Непредвиденная ошибка при скачивании: {e}")
                     return
             self.after(0, self._refresh_hw_label)
-            self.after(0, self.log, "🎉 Модели готовы. Нажмите «Старт» ещё раз для перевода.")
+            self.log("🎉 Модели готовы. Нажмите «Старт» ещё раз для перевода.")
             self.after(0, lambda: messagebox.showinfo("Готово", "Модель(и) скачаны. Нажмите «Старт»."))
 
         self._dl_thread = threading.Thread(target=work, daemon=True)
         self._dl_thread.start()
 
     def set_key(self):
-        base_dir = _base_dir_for_user_files()
-        secrets_path = os.path.join(base_dir, "secrets.json")
+        secrets_path = config.SECRETS_PATH  # BASE_DIR/secrets.json, посчитан на импорте
 
         win = tk.Toplevel(self)
         win.title("OpenAI API Key")
@@ -420,9 +458,7 @@ class App(tk.Tk):
             if not key:
                 messagebox.showerror("Ошибка", "Ключ пустой.")
                 return
-            os.makedirs(base_dir, exist_ok=True)
-            with open(secrets_path, "w", encoding="utf-8") as f:
-                json.dump({"OPENAI_API_KEY": key}, f, ensure_ascii=False, indent=2)
+            atomic_write_text(secrets_path, json.dumps({"OPENAI_API_KEY": key}, ensure_ascii=False))
             # применяем ключ в текущей сессии (иначе _run_job взял бы пустой)
             config.OPENAI_API_KEY = key
             config.PROVIDER.external_api_key = key
@@ -440,7 +476,12 @@ class App(tk.Tk):
         out_dir = os.path.abspath(os.path.expanduser(out_dir))
         os.makedirs(out_dir, exist_ok=True)
         if os.name == "posix":
-            os.system(f'open "{out_dir}"')
+            # без /bin/sh: путь уходит аргументом, кавычки в нём не ломают команду
+            opener = "open" if sys.platform == "darwin" else "xdg-open"
+            try:
+                subprocess.Popen([opener, out_dir], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            except Exception:
+                messagebox.showinfo("Папка вывода", out_dir)
         else:
             try:
                 os.startfile(out_dir)  # type: ignore[attr-defined]
@@ -448,9 +489,24 @@ class App(tk.Tk):
                 messagebox.showinfo("Папка вывода", out_dir)
 
     def log(self, msg: str):
-        self.txt.insert("end", msg + "\n")
+        # потокобезопасно: строка уходит в очередь, в виджет её кладёт _drain_ticks
+        self._log_queue.append(msg)
+
+    def _flush_log(self):
+        lines = []
+        while True:
+            try:
+                lines.append(self._log_queue.popleft())
+            except IndexError:
+                break
+        if not lines:
+            return
+        self.txt.insert("end", "\n".join(lines) + "\n")
+        # в виджете держим только хвост: Text хранит каждую строку в B-дереве
+        excess = int(self.txt.index("end-1c").split(".")[0]) - 1 - LOG_TAIL
+        if excess > 0:
+            self.txt.delete("1.0", f"{excess + 1}.0")
         self.txt.see("end")
-        self.update_idletasks()
 
     # ---------- прогресс ----------
 
@@ -464,13 +520,30 @@ class App(tk.Tk):
         self._update_progress_ui()
 
     def _on_tick(self, inc_done: int, inc_ok: int, inc_err: int, inc_skip: int):
-        def apply():
-            self.done_var.set(self.done_var.get() + inc_done)
-            self.ok_var.set(self.ok_var.get() + inc_ok)
-            self.err_var.set(self.err_var.get() + inc_err)
-            self.skip_var.set(self.skip_var.get() + inc_skip)
+        # вызывается из воркера: без after() на каждый файл — только в очередь
+        self._tick_queue.put((inc_done, inc_ok, inc_err, inc_skip))
+
+    def _drain_ticks(self):
+        self._flush_log()
+        done = ok = err = skip = 0
+        got = False
+        while True:
+            try:
+                d, o, e, s = self._tick_queue.get_nowait()
+            except queue.Empty:
+                break
+            done += d
+            ok += o
+            err += e
+            skip += s
+            got = True
+        if got:
+            self.done_var.set(self.done_var.get() + done)
+            self.ok_var.set(self.ok_var.get() + ok)
+            self.err_var.set(self.err_var.get() + err)
+            self.skip_var.set(self.skip_var.get() + skip)
             self._update_progress_ui()
-        self.after(0, apply)
+        self.after(TICK_DRAIN_MS, self._drain_ticks)
 
     def _update_progress_ui(self):
         total = self.total_var.get() or 1
@@ -496,7 +569,7 @@ class App(tk.Tk):
     # ---------- запуск ----------
 
     def start(self):
-        if self._worker and self._worker.is_alive():
+        if self._future and not self._future.done():
             messagebox.showinfo("Занято", "Процесс уже идёт…")
             return
 
@@ -524,42 +597,103 @@ class App(tk.Tk):
             f"lang: {self.lang_var.get()} | provider: {self.mode_var.get()}"
         )
         self._on_total(0)
-        self._worker = threading.Thread(target=self._run_job, args=(inp, out, not self.dry_var.get()), daemon=True)
-        self._worker.start()
+        write = not self.dry_var.get()
+        self._future = self._submit_job(self._run_job, inp, out, write)
+        self._future.add_done_callback(
+            lambda f: None if self._closing.is_set() else self.after(0, self._on_job_done, f, out, write)
+        )
+
+    @staticmethod
+    def _submit_job(fn, *args) -> Future:
+        """
+        fn(*args) в daemon-потоке, результат/ошибка — в Future. Не
+        ThreadPoolExecutor: его потоки интерпретатор дожидается на выходе, а
+        перевод, уже ушедший в модель (GGUF-пачка, ретраи с паузами до 30 с,
+        целый jar), границы файла может не достигать минутами — закрытое окно
+        висело бы невидимым процессом.
+        """
+        fut: Future = Future()
+
+        def run():
+            if not fut.set_running_or_notify_cancel():
+                return
+            try:
+                fut.set_result(fn(*args))
+            except BaseException as e:
+                fut.set_exception(e)
+
+        threading.Thread(target=run, name="mirror", daemon=True).start()
+        return fut
+
+    @staticmethod
+    def _warm_imports():
+        # Модули оседают в sys.modules; локальные импорты в _run_job после этого
+        # бесплатны (а если прогрев ещё идёт — import lock просто дождётся его).
+        try:
+            import src.translators  # noqa: F401
+            import src.utils.cache  # noqa: F401
+            import src.mirrorer  # noqa: F401
+            from src.llm import factory  # noqa: F401
+        except Exception:
+            # ошибку импорта честно покажет сам _run_job при «Старт»
+            pass
 
     def _run_job(self, inp: str, out: str, write: bool):
-        cache = TranslationCache(config.DEFAULT_CACHE_PATH)
+        from src.translators import Translator
+        from src.utils.cache import TranslationCache
+        from src.llm import build_clients
+        from src.mirrorer import mirror_translate_dir
 
         # Собираем клиент(ы) по текущему режиму провайдера.
         cfg = config.PROVIDER
         cfg.mode = self.mode_var.get()
         cfg.external_api_key = config.OPENAI_API_KEY  # подхватить ключ, если задан
-        primary, complex_client = build_clients(cfg)
-
-        def _logger(s: str):
-            self.after(0, self.log, s)
 
-        tr = Translator(
-            primary,
-            cache,
-            strict=True,
-            complex_client=complex_client,
-            log=_logger,
+        # Кэш и переводчик переиспользуем между «Старт»: кэш перечитывается с
+        # диска только при смене пути, клиенты (в т.ч. загруженная GGUF-модель)
+        # пересобираются только при смене провайдера/модели/ключа. Язык — это
+        # параметр вызова, пересборки не требует.
+        cache_path = config.DEFAULT_CACHE_PATH
+        if self._cache is None or self._cache.path != cache_path:
+            self._cache = TranslationCache(cache_path)
+            self._translator = None
+        tr_key = (astuple(cfg), cache_path)
+        if self._translator is None or self._translator_key != tr_key:
+            primary, complex_client = build_clients(cfg)
+            self._translator = Translator(
+                primary,
+                self._cache,
+                strict=True,
+                complex_client=complex_client,
+                log=self.log,
+            )
+            self._translator_key = tr_key
+        tr = self._translator
+
+        mirror_translate_dir(
+            inp,
+            out,
+            tr,
+            log=self.log,
+            write=write,
+            on_total=lambda total: self.after(0, self._on_total, total),
+            on_tick=self._on_tick,
         )
 
-        try:
-            mirror_translate_dir(
-                inp,
-                out,
-                tr,
-                log=_logger,
-                write=write,
-                on_total=lambda total: self.after(0, self._on_total, total),
-                on_tick=lambda inc_done, inc_ok, inc_err, inc_skip: self._on_tick(inc_done, inc_ok, inc_err, inc_skip),
-            )
-            self.after(0, self.log, f"✅ Готово. Результат: {out} ({'dry-run' if not write else 'saved'})")
-        except Exception as e:
-            self.after(0, self.log, f"❌ Ошибка: {e}")
+    def _on_job_done(self, fut: Future, out: str, write: bool):
+        if fut.cancelled():
+            return
+        e = fut.exception()
+        if e is None:
+            self.log(f"✅ Готово. Результат: {out} ({'dry-run' if not write else 'saved'})")
+        else:
+            self.log(f"❌ Ошибка: {e}")
+
+    def _on_close(self):
+        # воркер — daemon: процесс завершится вместе с окном; флаг гасит
+        # колбэки, которые он успеет вызвать до выхода
+        self._closing.set()
+        self.destroy()
 
 
 def main():
@@ -1,7 +1,7 @@
 # src/llm/__init__.py
 from __future__ import annotations
 
-from .base import LLMClient, Message, LLMClientError, RateLimitError
+from .base import LLMClient, Message, LLMClientError, RateLimitError, ServerError
 from .openai_compatible import OpenAICompatibleClient
 from .local_llamacpp import LocalLlamaCppClient
 from .factory import build_clients
@@ -15,6 +15,7 @@ __all__ = [
     "Message",
     "LLMClientError",
     "RateLimitError",
+    "ServerError",
     "OpenAICompatibleClient",
     "LocalLlamaCppClient",
     "build_clients",
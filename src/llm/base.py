@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 # Тип одного сообщения чата: {"role": "system"|"user"|"assistant", "content": "..."}
 Message = Dict[str, str]
@@ -13,7 +13,18 @@ class LLMClientError(Exception):
 
 
 class RateLimitError(LLMClientError):
-    """Провайдер вернул 429 / rate limit. Ретраится в Translator._retry_call."""
+    """
+    Провайдер вернул 429 / rate limit. Ретраится в Translator._retry_call.
+    retry_after — пауза из заголовка Retry-After (секунды), если сервер её дал.
+    """
+
+    def __init__(self, *args: Any, retry_after: Optional[float] = None):
+        super().__init__(*args)
+        self.retry_after = retry_after
+
+
+class ServerError(LLMClientError):
+    """Провайдер вернул 5xx — временный сбой на его стороне, ретраится как сетевой."""
 
 
 class LLMClient(ABC):
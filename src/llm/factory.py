@@ -4,6 +4,7 @@ from __future__ import annotations
 import os
 from typing import Optional, Tuple, TYPE_CHECKING
 
+from .. import config
 from .base import LLMClient
 from .openai_compatible import OpenAICompatibleClient
 from .local_llamacpp import LocalLlamaCppClient
@@ -17,7 +18,7 @@ if TYPE_CHECKING:
 def _make_external(cfg) -> OpenAICompatibleClient:
     return OpenAICompatibleClient(
         base_url=cfg.external_base_url,
-        api_key=cfg.external_api_key,
+        api_key=cfg.external_api_key or config.OPENAI_API_KEY,
         model=cfg.external_model,
     )
 
@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import platform
+import threading
 from typing import Any, List, Optional
 
 from .base import LLMClient, Message, LLMClientError
@@ -75,8 +76,11 @@ def _auto_n_gpu_layers() -> int:
 #  2) IN-PROCESS MODE (llama-cpp-python):
 #     грузим модель прямо в процесс через `llama_cpp.Llama`. Проще в дистрибуции
 #     (одно приложение), но: тяжёлая загрузка весов, инференс под GIL —
-#     параллелизм по воркерам эффекта почти не даёт, лучше выставить
-#     MAX_WORKERS_FILES=1. Подходит для одиночной машины/CLI.
+#     параллелизм по воркерам эффекта почти не даёт. Один объект Llama не
+#     потокобезопасен, а потоки файлов, jar'ов и пачек translate_many к
+#     нему сходятся вместе — поэтому загрузка и инференс идут под замком
+#     клиента (_llm_lock), по одному запросу за раз. Подходит для одиночной
+#     машины/CLI.
 #
 # STEP 4: сама модель/веса и оптимальные n_ctx/n_gpu_layers подбираются на
 # этапе бенчмарка — здесь только каркас и корректный интерфейс chat().
@@ -117,6 +121,8 @@ class LocalLlamaCppClient(LLMClient):
         # ленивая инициализация
         self._llm = None          # экземпляр llama_cpp.Llama (in-process)
         self._server = None       # OpenAICompatibleClient (server mode)
+        # in-process: один Llama на все потоки — вызовы строго по одному
+        self._llm_lock = threading.Lock()
 
     @property
     def name(self) -> str:
@@ -204,7 +210,6 @@ class LocalLlamaCppClient(LLMClient):
             return self._ensure_server().chat(messages, **kwargs)
 
         # in-process mode
-        llm = self._ensure_llm()
         params = dict(
             messages=messages,
             temperature=kwargs.get("temperature", self.default_temperature),
@@ -216,7 +221,8 @@ class LocalLlamaCppClient(LLMClient):
         if kwargs.get("response_format") is not None:
             params["response_format"] = kwargs["response_format"]
 
-        resp = llm.create_chat_completion(**params)
+        with self._llm_lock:
+            resp = self._ensure_llm().create_chat_completion(**params)
         try:
             return resp["choices"][0]["message"]["content"].strip()
         except (KeyError, IndexError, TypeError) as e:
@@ -1,23 +1,48 @@
 # src/llm/openai_compatible.py
 from __future__ import annotations
 
-import json
 import ssl
+import time
+import threading
 import urllib.error
-import urllib.request
-from typing import Any, List, Optional
+from email.utils import parsedate_to_datetime
+from typing import Any, List, Optional, Tuple
 
 import certifi
+import httpx
 
-from .base import LLMClient, Message, RateLimitError, LLMClientError
+try:
+    import h2  # type: ignore  # noqa: F401  # HTTP/2 для httpx — опционально
+    _HTTP2 = True
+except Exception:
+    _HTTP2 = False
+
+from .. import config
+from ..utils import json_fast
+from .base import LLMClient, Message, RateLimitError, LLMClientError, ServerError
+
+
+def _retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    """Retry-After: число секунд или HTTP-дата → секунды ожидания (None, если нет/мусор)."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
 
 
 class OpenAICompatibleClient(LLMClient):
     """
     Клиент для любого OpenAI-совместимого Chat Completions API.
 
-    Это ровно та же сетевая логика, что раньше была зашита в Translator
-    (urllib → POST {base_url}/v1/chat/completions), но теперь:
+    Это та же сетевая логика, что раньше была зашита в Translator
+    (POST {base_url}/v1/chat/completions, теперь через пул httpx), но теперь:
       - base_url конфигурируется (закрывает R-4 / Q-1): OpenAI, DeepSeek, Qwen,
         llama.cpp server, LM Studio, Ollama (/v1), vLLM, groq, together...
       - пустой api_key допустим (локальные серверы обычно не требуют ключ).
@@ -33,6 +58,7 @@ class OpenAICompatibleClient(LLMClient):
         organization: Optional[str] = None,
         default_temperature: float = 0.0,
         extra_body: Optional[dict] = None,
+        max_connections: Optional[int] = None,
     ):
         self.base_url = (base_url or "https://api.openai.com").rstrip("/")
         self.api_key = api_key or ""
@@ -45,10 +71,64 @@ class OpenAICompatibleClient(LLMClient):
         self.extra_body = dict(extra_body or {})
         self._ssl_ctx = ssl.create_default_context(cafile=certifi.where())
 
+        # Один httpx.Client на клиента: он потокобезопасен и держит общий пул
+        # keep-alive соединений (воркеры mirrorer'а шлют запросы параллельно,
+        # без TCP/TLS-рукопожатия на каждый батч); с h2 параллельные батчи
+        # мультиплексируются в одном TLS-соединении. Прокси из окружения
+        # (HTTP(S)_PROXY) httpx понимает сам (trust_env). Создаётся лениво.
+        self._http: Optional[httpx.Client] = None
+        self._http_lock = threading.Lock()
+        self._max_connections = max(1, int(
+            max_connections or getattr(config, "HTTP_MAX_CONNECTIONS", 20)
+        ))
+
     @property
     def name(self) -> str:
         return f"openai-compatible({self.model}@{self.base_url})"
 
+    # ---------- транспорт ----------
+
+    def _http_client(self) -> httpx.Client:
+        with self._http_lock:
+            if self._http is None:
+                self._http = httpx.Client(
+                    http2=_HTTP2,
+                    verify=self._ssl_ctx,
+                    timeout=httpx.Timeout(self.timeout, connect=10.0),
+                    limits=httpx.Limits(
+                        max_connections=self._max_connections,
+                        max_keepalive_connections=self._max_connections,
+                    ),
+                )
+            return self._http
+
+    def _post_httpx(self, url: str, body: bytes, headers: dict, timeout: float) -> Tuple[int, bytes, Any]:
+        """
+        POST через общий httpx.Client → (status, тело, заголовки ответа).
+        Сетевые ошибки наружу — как TimeoutError / urllib.error.URLError (их
+        ретраит Translator._retry_call).
+        """
+        try:
+            r = self._http_client().post(
+                url, content=body, headers=headers,
+                timeout=httpx.Timeout(timeout, connect=min(10.0, timeout)),
+            )
+        except httpx.TimeoutException as e:
+            raise TimeoutError(str(e)) from e
+        except httpx.HTTPError as e:
+            raise urllib.error.URLError(e) from e
+        return r.status_code, r.content, r.headers
+
+    def close(self) -> None:
+        """Закрыть пул соединений (следующий запрос откроет новый)."""
+        with self._http_lock:
+            http, self._http = self._http, None
+        if http is not None:
+            try:
+                http.close()
+            except Exception:
+                pass
+
     def chat(self, messages: List[Message], **kwargs: Any) -> str:
         url = f"{self.base_url}/v1/chat/completions"
 
@@ -80,26 +160,19 @@ class OpenAICompatibleClient(LLMClient):
         if self.organization:
             headers["OpenAI-Organization"] = self.organization
 
-        req = urllib.request.Request(
-            url,
-            data=json.dumps(payload).encode("utf-8"),
-            headers=headers,
-            method="POST",
-        )
-
+        body = json_fast.dumps(payload)
         timeout = float(kwargs.get("timeout", self.timeout))
-        try:
-            with urllib.request.urlopen(req, timeout=timeout, context=self._ssl_ctx) as resp:
-                data = json.loads(resp.read().decode("utf-8"))
-        except urllib.error.HTTPError as e:
-            body = ""
-            try:
-                body = e.read().decode("utf-8", "replace")
-            except Exception:
-                pass
-            if e.code == 429:
-                raise RateLimitError(f"429 rate limit: {body[:300]}") from e
-            raise LLMClientError(f"HTTP {e.code}: {body[:300]}") from e
+        status, raw, resp_headers = self._post_httpx(url, body, headers, timeout)
+
+        if status >= 300:  # редиректы httpx по умолчанию не выполняет — тоже ошибка
+            text = raw.decode("utf-8", "replace")
+            if status == 429:
+                retry_after = _retry_after_seconds(resp_headers.get("Retry-After"))
+                raise RateLimitError(f"429 rate limit: {text[:300]}", retry_after=retry_after)
+            if status >= 500:
+                raise ServerError(f"HTTP {status}: {text[:300]}")
+            raise LLMClientError(f"HTTP {status}: {text[:300]}")
+        data = json_fast.loads(raw)  # bytes сразу в парсер, без decode
 
         try:
             return data["choices"][0]["message"]["content"].strip()
@@ -13,9 +13,6 @@ if __name__ == "__main__" and (__package__ is None or __package__ == ""):
     __package__ = "src"
 # ------------------------------------------------------------
 
-from src.gui.api import Api
-
-
 def _resource_dir() -> str:
     """
     Путь к папке со статикой web/. В PyInstaller-onefile файлы распаковываются
@@ -33,6 +30,9 @@ def _resource_dir() -> str:
 
 def main():
     import webview  # импорт здесь, чтобы модуль импортировался и без pywebview
+    # Api тянет весь стек перевода (processors, snbt-парсер, HTTP-клиенты) —
+    # тоже импортируем только при реальном запуске окна
+    from src.gui.api import Api
 
     index = os.path.join(_resource_dir(), "index.html")
     api = Api()
@@ -1,14 +1,14 @@
 # src/mirrorer.py
 from __future__ import annotations
 import os
-import json
+import threading
 from typing import Callable, List, Tuple, Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from zipfile import ZipFile, BadZipFile
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 
 from .processors import lang_json, generic_json, ftb_snbt, kubejs_js, jar_lang
 from .processors.snbt_structured import translate_snbt_file_structured
-from .utils.helpers import ensure_dir_for_file
+from .utils.helpers import ensure_dir_for_file, read_text_lf, write_text_lf
+from .utils import json_fast
 from . import config
 
 
@@ -16,6 +16,78 @@ def _rel(base: str, p: str) -> str:
     return os.path.relpath(p, start=base).replace("\\", "/")
 
 
+class _BatchTranslator:
+    """
+    Обёртка над Translator: мелкие translate_many из параллельных воркеров
+    склеиваются в один вызов (group commit). Первый пришедший в пустую очередь
+    поток — «ведущий»: ждёт до delay секунд или пока не наберётся size строк,
+    забирает очередь, шлёт одну пачку и раздаёт срезы результата по Future.
+    Остальное (translate, cache, flush…) проксируется как есть.
+    """
+
+    def __init__(self, inner, size: int, delay: float):
+        self._inner = inner
+        self._size = size
+        self._delay = delay
+        self._lock = threading.Lock()
+        self._full = threading.Event()
+        self._pending: List[Tuple[Future, List[str], str]] = []
+        self._count = 0
+
+    def __getattr__(self, name):
+        return getattr(self._inner, name)
+
+    def __setattr__(self, name, value):
+        # свои поля — на обёртке; всё прочее (напр. _memo процессоров) —
+        # на самом переводчике, чтобы переживало запуск
+        if name in self.__dict__ or name in _BatchTranslator._OWN:
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self._inner, name, value)
+
+    _OWN = frozenset({"_inner", "_size", "_delay", "_lock", "_full", "_pending", "_count"})
+
+    def translate_many(self, texts: List[str], target_lang: str = "ru_ru") -> List[str]:
+        texts = list(texts)
+        if not texts:
+            return []
+        if len(texts) >= self._size:  # и так крупная пачка — без ожидания
+            return self._inner.translate_many(texts, target_lang=target_lang)
+
+        fut: Future = Future()
+        with self._lock:
+            leader = not self._pending
+            self._pending.append((fut, texts, target_lang))
+            self._count += len(texts)
+            if self._count >= self._size:
+                self._full.set()
+
+        if leader:
+            self._full.wait(self._delay)
+            with self._lock:
+                batch, self._pending, self._count = self._pending, [], 0
+                self._full.clear()
+            self._flush(batch)
+        return fut.result()
+
+    def _flush(self, batch: List[Tuple[Future, List[str], str]]) -> None:
+        by_lang: dict = {}
+        for item in batch:
+            by_lang.setdefault(item[2], []).append(item)
+        for lang, items in by_lang.items():
+            flat = [t for _, texts, _ in items for t in texts]
+            try:
+                out = self._inner.translate_many(flat, target_lang=lang)
+            except Exception as e:
+                for f, _, _ in items:
+                    f.set_exception(e)
+                continue
+            off = 0
+            for f, texts, _ in items:
+                f.set_result(out[off : off + len(texts)])
+                off += len(texts)
+
+
 def _ensure_readable(base_input: str) -> None:
     """
     Явно проверяем, что входную папку МОЖНО читать.
@@ -40,55 +112,122 @@ def _ensure_readable(base_input: str) -> None:
         ) from e
 
 
-def _is_lang_en_us(path_norm: str) -> bool:
-    return path_norm.endswith("/lang/en_us.json") and "/assets/" in path_norm
+def _classify(path_norm: str) -> Optional[str]:
+    """
+    Тип кандидата ("lang" / "patchouli" / "tips" / "snbt" / "kubejs") или None.
+    Сначала ветвимся по расширению, "/assets/" для json проверяем один раз;
+    порядок json-типов — как раньше (lang важнее patchouli, patchouli — tips).
+    """
+    if path_norm.endswith(".json"):
+        if "/assets/" not in path_norm:
+            return None
+        if path_norm.endswith("/lang/en_us.json"):
+            return "lang"
+        if "/patchouli_books/" in path_norm and "/en_us/" in path_norm:
+            return "patchouli"
+        if "/tips/" in path_norm:
+            return "tips"
+        return None
+    if path_norm.endswith(".snbt"):
+        return "snbt" if "/ftbquests/" in path_norm else None
+    if path_norm.endswith(".js"):
+        return "kubejs" if "/kubejs/" in path_norm else None
+    return None
 
 
-def _is_patchouli_json(path_norm: str) -> bool:
-    return (
-        "/assets/" in path_norm
-        and "/patchouli_books/" in path_norm
-        and "/en_us/" in path_norm
-        and path_norm.endswith(".json")
-    )
+def _is_candidate(path_norm: str) -> bool:
+    # те же правила, что и для диспетчеризации: одна таблица — _classify
+    return _classify(path_norm) is not None
 
 
-def _is_tips_json(path_norm: str) -> bool:
-    return "/assets/" in path_norm and "/tips/" in path_norm and path_norm.endswith(".json")
+# На POSIX разделитель уже «/» — нормализация путей там лишняя
+_NEEDS_NORM = os.sep != "/"
 
+# Подстроки пути, без которых файл не может быть кандидатом (см. _is_candidate)
+_CANDIDATE_DIR_MARKERS = ("/assets/", "/ftbquests/", "/kubejs/")
 
-def _want_ftb_snbt(path_norm: str) -> bool:
-    return "/ftbquests/" in path_norm and path_norm.endswith(".snbt")
 
+def _scan_tree(base: str, onerror: Callable[[OSError], None]):
+    """
+    Обход дерева на os.scandir (аналог os.walk topdown, followlinks=False):
+    отдаёт (папка, папка с "/" разделителями, имена файлов). Тип записи берём из
+    DirEntry — без лишних stat на каждый файл; нормализованный путь считаем
+    один раз на папку. Ошибки открытия папок уходят в onerror, как у os.walk.
+    """
+    stack = [base]
+    while stack:
+        top = stack.pop()
+        try:
+            it = os.scandir(top)
+        except OSError as e:
+            onerror(e)
+            continue
+        fnames: List[str] = []
+        subdirs: List[str] = []
+        with it:
+            for e in it:
+                try:
+                    is_dir = e.is_dir()
+                except OSError:
+                    is_dir = False
+                if not is_dir:
+                    fnames.append(e.name)
+                    continue
+                try:
+                    if e.is_symlink():
+                        continue
+                except OSError:
+                    continue
+                subdirs.append(e.path)
+        yield top, (top.replace("\\", "/") if _NEEDS_NORM else top), fnames
+        # обратный порядок → обход в том же порядке, что и os.walk
+        stack.extend(reversed(subdirs))
 
-def _want_kubejs_js(path_norm: str) -> bool:
-    return "/kubejs/" in path_norm and path_norm.endswith(".js")
 
+def _dst_rel_lang(rel: str) -> str:
+    return f"{os.path.dirname(rel)}/{config.TARGET_LANG}.json"
 
-def _is_candidate(path_norm: str) -> bool:
-    return (
-        _is_lang_en_us(path_norm)
-        or _is_patchouli_json(path_norm)
-        or _is_tips_json(path_norm)
-        or _want_ftb_snbt(path_norm)
-        or _want_kubejs_js(path_norm)
-    )
 
+def _dst_rel_patchouli(rel: str) -> str:
+    return rel.replace("/en_us/", f"/{config.TARGET_LANG}/")
 
-def _dst_exists(out_root: str, rel: str) -> bool:
-    if rel.endswith("/lang/en_us.json"):
-        dst_ru = os.path.join(out_root, os.path.dirname(rel), f"{config.TARGET_LANG}.json")
-        return os.path.exists(dst_ru)
-    if "/patchouli_books/" in rel and "/en_us/" in rel:
-        rel_ru = rel.replace("/en_us/", f"/{config.TARGET_LANG}/")
-        return os.path.exists(os.path.join(out_root, rel_ru))
-    if "/tips/" in rel and rel.endswith(".json"):
-        return os.path.exists(os.path.join(out_root, rel))
-    if rel.endswith(".snbt"):
-        return os.path.exists(os.path.join(out_root, rel))
-    if rel.endswith(".js"):
-        return os.path.exists(os.path.join(out_root, rel))
-    return False
+
+def _dst_rel_same(rel: str) -> str:
+    return rel
+
+
+# тип кандидата (_classify) → куда пишется результат (относительный путь)
+_DST_REL = {
+    "lang": _dst_rel_lang,
+    "patchouli": _dst_rel_patchouli,
+    "tips": _dst_rel_same,
+    "snbt": _dst_rel_same,
+    "kubejs": _dst_rel_same,
+}
+
+
+def _build_out_index(out_root: str) -> frozenset:
+    """
+    Все файлы out_root (относительные пути через «/») — одним сканом, чтобы
+    проверка «уже переведён» не делала stat на каждого кандидата.
+    """
+    if not os.path.isdir(out_root):
+        return frozenset()
+    idx = set()
+    for top, _top_norm, fnames in _scan_tree(out_root, lambda _e: None):
+        rel_dir = _rel(out_root, top)
+        prefix = "" if rel_dir == "." else rel_dir + "/"
+        idx.update(prefix + n for n in fnames)
+    return frozenset(idx)
+
+
+def _dst_exists(
+    out_root: str, rel: str, kind: str, out_index: Optional[frozenset] = None
+) -> bool:
+    rel_dst = _DST_REL[kind](rel)
+    if out_index is not None:
+        return rel_dst in out_index
+    return os.path.exists(os.path.join(out_root, rel_dst))
 
 
 def _process_file(
@@ -98,6 +237,8 @@ def _process_file(
     translator,
     write: bool,
     log: Callable[[str], None],
+    out_index: Optional[frozenset] = None,
+    path_norm: Optional[str] = None,
 ) -> Tuple[bool, bool, bool]:
     """
     Возвращает (matched, ok, skipped)
@@ -106,162 +247,121 @@ def _process_file(
       skipped  — был пропущен из-за уже существующего dst
     """
     rel = _rel(base_input, src_path)
-    path_norm = src_path.replace("\\", "/")
+    if path_norm is None:  # сканер обычно уже передал нормализованный путь
+        path_norm = src_path.replace("\\", "/") if _NEEDS_NORM else src_path
 
-    if not _is_candidate(path_norm):
+    kind = _classify(path_norm)
+    if kind is None:
         return False, False, False
 
     # уже готов — считаем как matched+ok+skipped
-    if write and _dst_exists(out_root, rel):
+    if write and _dst_exists(out_root, rel, kind, out_index):
         log(f"[SKIP][exists] {rel}")
         return True, True, True
 
-    # 1) lang/en_us.json → ru_ru.json
-    if _is_lang_en_us(path_norm):
-        dst_ru = os.path.join(out_root, os.path.dirname(rel), f"{config.TARGET_LANG}.json")
-        try:
-            if write:
-                os.makedirs(os.path.dirname(dst_ru), exist_ok=True)
-                lang_json.translate_lang_json(src_path, dst_ru, translator)
-                log(f"[OK][lang] {rel} → {os.path.relpath(dst_ru, out_root)}")
-            else:
-                with open(src_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                vals = [v for v in data.values() if isinstance(v, str)]
-                if vals:
-                    translator.translate_many(vals, target_lang=config.TARGET_LANG)
-                log(f"[DRY][lang] {rel}")
-            return True, True, False
-        except Exception as e:
-            log(f"[ERR][lang] {rel}: {e}")
-            return True, False, False
-
-    # 2) patchouli en_us → ru_ru
-    if _is_patchouli_json(path_norm):
-        rel_ru = rel.replace("/en_us/", f"/{config.TARGET_LANG}/")
-        dst_ru = os.path.join(out_root, rel_ru)
-        try:
-            if write:
-                os.makedirs(os.path.dirname(dst_ru), exist_ok=True)
-                generic_json.translate_generic_json_file(src_path, dst_ru, translator)
-                log(f"[OK][patchouli] {rel} → {rel_ru}")
-            else:
-                with open(src_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-
-                acc: List[str] = []
-
-                def collect(n):
-                    if isinstance(n, str):
-                        acc.append(n)
-                        return
-                    if isinstance(n, list):
-                        for i in n:
-                            collect(i)
-                    elif isinstance(n, dict):
-                        for v in n.values():
-                            collect(v)
-
-                collect(data)
-                if acc:
-                    translator.translate_many(acc, target_lang=config.TARGET_LANG)
-                log(f"[DRY][patchouli] {rel}")
-            return True, True, False
-        except Exception as e:
-            log(f"[ERR][patchouli] {rel}: {e}")
-            return True, False, False
-
-    # 3) tips/*.json → тот же путь
-    if _is_tips_json(path_norm):
-        dst = os.path.join(out_root, rel)
-        try:
-            if write:
-                os.makedirs(os.path.dirname(dst), exist_ok=True)
-                generic_json.translate_generic_json_file(src_path, dst, translator)
-                log(f"[OK][tips] {rel}")
-            else:
-                with open(src_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-
-                acc: List[str] = []
-
-                def collect(n):
-                    if isinstance(n, str):
-                        acc.append(n)
-                        return
-                    if isinstance(n, list):
-                        for i in n:
-                            collect(i)
-                    elif isinstance(n, dict):
-                        for v in n.values():
-                            collect(v)
-
-                collect(data)
-                if acc:
-                    translator.translate_many(acc, target_lang=config.TARGET_LANG)
-                log(f"[DRY][tips] {rel}")
-            return True, True, False
-        except Exception as e:
-            log(f"[ERR][tips] {rel}: {e}")
-            return True, False, False
-
-    # 4) FTB Quests .snbt  — новый структурный перевод + запасной старый
-    if _want_ftb_snbt(path_norm):
-        dst = os.path.join(out_root, rel)
-        try:
-            if write:
-                os.makedirs(os.path.dirname(dst), exist_ok=True)
-                try:
-                    # новый путь: SNBT → NBT → рекурсивный перевод → SNBT
-                    translate_snbt_file_structured(src_path, dst, translator)
-                    log(f"[OK][snbt-struct] {rel}")
-                except Exception as e_struct:
-                    # запасной вариант — старый regex-проход, чтобы не потерять файл
-                    log(f"[WARN][snbt-struct] {rel}: {e_struct} → fallback ftb_snbt")
-                    with open(src_path, "r", encoding="utf-8") as f:
-                        text = f.read()
-                    out = ftb_snbt.translate_ftb_snbt_text(text, translator)
-                    with open(dst, "w", encoding="utf-8", newline="\n") as f:
-                        f.write(out)
-                    log(f"[OK][snbt] {rel}")
-            else:
-                log(f"[DRY][snbt] {rel}")
-            return True, True, False
-        except Exception as e:
-            log(f"[ERR][snbt] {rel}: {e}")
-            return True, False, False
-
-    # 5) KubeJS .js
-    if _want_kubejs_js(path_norm):
-        dst = os.path.join(out_root, rel)
-        try:
-            if write:
-                os.makedirs(os.path.dirname(dst), exist_ok=True)
-                kubejs_js.translate_kubejs_script_file(src_path, dst, translator)
-                log(f"[OK][kubejs] {rel}")
-            else:
-                log(f"[DRY][kubejs] {rel}")
-            return True, True, False
-        except Exception as e:
-            log(f"[ERR][kubejs] {rel}: {e}")
-            return True, False, False
-
-    return False, False, False
+    try:
+        _HANDLERS[kind](src_path, rel, out_root, translator, write, log)
+        return True, True, False
+    except Exception as e:
+        log(f"[ERR][{kind}] {rel}: {e}")
+        return True, False, False
+
+
+# ---------- обработчики по типу кандидата ----------
+# (src_path, rel, out_root, translator, write, log); ошибки ловит _process_file
+
+def _handle_lang(src_path: str, rel: str, out_root: str, translator, write: bool, log) -> None:
+    # lang/en_us.json → ru_ru.json
+    dst_ru = os.path.join(out_root, _dst_rel_lang(rel))
+    if write:
+        os.makedirs(os.path.dirname(dst_ru), exist_ok=True)
+        lang_json.translate_lang_json(src_path, dst_ru, translator)
+        log(f"[OK][lang] {rel} → {os.path.relpath(dst_ru, out_root)}")
+        return
+    vals = list(json_fast.iter_top_strings(src_path))
+    if vals:
+        translator.translate_many(vals, target_lang=config.TARGET_LANG)
+    log(f"[DRY][lang] {rel}")
+
+
+def _handle_patchouli(src_path: str, rel: str, out_root: str, translator, write: bool, log) -> None:
+    # patchouli en_us → ru_ru
+    rel_ru = _dst_rel_patchouli(rel)
+    dst_ru = os.path.join(out_root, rel_ru)
+    if write:
+        os.makedirs(os.path.dirname(dst_ru), exist_ok=True)
+        generic_json.translate_generic_json_file(src_path, dst_ru, translator)
+        log(f"[OK][patchouli] {rel} → {rel_ru}")
+        return
+    acc = list(json_fast.iter_strings(src_path))
+    if acc:
+        translator.translate_many(acc, target_lang=config.TARGET_LANG)
+    log(f"[DRY][patchouli] {rel}")
+
+
+def _handle_tips(src_path: str, rel: str, out_root: str, translator, write: bool, log) -> None:
+    # tips/*.json → тот же путь
+    dst = os.path.join(out_root, rel)
+    if write:
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        generic_json.translate_generic_json_file(src_path, dst, translator)
+        log(f"[OK][tips] {rel}")
+        return
+    acc = list(json_fast.iter_strings(src_path))
+    if acc:
+        translator.translate_many(acc, target_lang=config.TARGET_LANG)
+    log(f"[DRY][tips] {rel}")
+
+
+def _handle_snbt(src_path: str, rel: str, out_root: str, translator, write: bool, log) -> None:
+    # FTB Quests .snbt — новый структурный перевод + запасной старый
+    dst = os.path.join(out_root, rel)
+    if not write:
+        acc = ftb_snbt.collect_ftb_snbt_strings(read_text_lf(src_path))
+        if acc:
+            translator.translate_many(acc, target_lang=config.TARGET_LANG)
+        log(f"[DRY][snbt] {rel}")
+        return
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    try:
+        # новый путь: SNBT → NBT → рекурсивный перевод → SNBT
+        translate_snbt_file_structured(src_path, dst, translator)
+        log(f"[OK][snbt-struct] {rel}")
+    except Exception as e_struct:
+        # запасной вариант — старый regex-проход, чтобы не потерять файл
+        log(f"[WARN][snbt-struct] {rel}: {e_struct} → fallback ftb_snbt")
+        text = read_text_lf(src_path)
+        out = ftb_snbt.translate_ftb_snbt_text(text, translator)
+        write_text_lf(dst, out)
+        log(f"[OK][snbt] {rel}")
+
+
+def _handle_kubejs(src_path: str, rel: str, out_root: str, translator, write: bool, log) -> None:
+    dst = os.path.join(out_root, rel)
+    if write:
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        kubejs_js.translate_kubejs_script_file(src_path, dst, translator)
+        log(f"[OK][kubejs] {rel}")
+        return
+    log(f"[DRY][kubejs] {rel}")
+
+
+_HANDLERS = {
+    "lang": _handle_lang,
+    "patchouli": _handle_patchouli,
+    "tips": _handle_tips,
+    "snbt": _handle_snbt,
+    "kubejs": _handle_kubejs,
+}
 
 
 def _jar_has_lang_en_us(jar_path: str) -> bool:
+    # Тот же критерий, что и в jar_lang.process_jar_lang. Раньше предскан искал
+    # "/assets/" внутри пути и пропускал обычные assets/<modid>/lang/en_us.json
+    # в корне архива — такие моды молча оставались без перевода.
     if not config.SCAN_JAR_LANG:
         return True
-    try:
-        with ZipFile(jar_path) as zf:
-            for name in zf.namelist():
-                if name.endswith("assets/minecraft/lang/en_us.json"):
-                    return True
-                if "/assets/" in name and name.endswith("/lang/en_us.json"):
-                    return True
-    except BadZipFile:
-        return False
-    return False
+    return jar_lang.jar_has_lang(jar_path)
 
 
 def mirror_translate_dir(
@@ -282,8 +382,14 @@ def mirror_translate_dir(
     # Доступ к входной папке — до скана (иначе os.walk молча вернёт пусто).
     _ensure_readable(base_input)
 
+    # мелкие пачки параллельных файлов/jar'ов — одним вызовом переводчика
+    if getattr(config, "COALESCE_STRINGS", 0) > 0:
+        translator = _BatchTranslator(
+            translator, config.COALESCE_STRINGS, getattr(config, "COALESCE_DELAY", 0.05)
+        )
+
     # 1) Скан: собираем кандидатов (не все файлы подряд)
-    candidates: List[str] = []
+    candidates: List[Tuple[str, str]] = []  # (путь, путь с "/")
     jar_files: List[str] = []
 
     # os.walk по умолчанию МОЛЧА игнорирует ошибки доступа к подпапкам —
@@ -295,16 +401,19 @@ def mirror_translate_dir(
         perm_denied.append(str(target))
         log(f"[WARN][access] нет доступа: {target} ({err})")
 
-    for root, _, fnames in os.walk(base_input, onerror=_on_walk_error):
-        r_norm = root.replace("\\", "/")
+    for root, r_norm, fnames in _scan_tree(base_input, _on_walk_error):
+        # все маркеры кандидатов ("/assets/", "/ftbquests/", "/kubejs/") лежат
+        # в пути папки — без них файлы папки даже не рассматриваем
+        maybe = any(mk in r_norm + "/" for mk in _CANDIDATE_DIR_MARKERS)
+        jars_here = "/mods/" in r_norm
         for fname in fnames:
-            full = os.path.join(root, fname)
-            pnorm = full.replace("\\", "/")
-            if fname.endswith(".jar") and "/mods/" in r_norm:
-                jar_files.append(full)
+            if fname.endswith(".jar") and jars_here:
+                jar_files.append(os.path.join(root, fname))
                 continue
-            if _is_candidate(pnorm):
-                candidates.append(full)
+            if maybe:
+                p_norm = f"{r_norm}/{fname}"
+                if _is_candidate(p_norm):
+                    candidates.append((os.path.join(root, fname), p_norm))
 
     # 2) Предскан JAR'ов
     jar_ready: List[str] = []
@@ -348,10 +457,16 @@ def mirror_translate_dir(
         if on_tick:
             on_tick(matched_inc, ok_inc, err_inc, skip_inc)
 
+    # уже готовые результаты — один скан out_root вместо stat на кандидата
+    out_index = _build_out_index(out_root) if write else None
+
     with ThreadPoolExecutor(max_workers=getattr(config, "MAX_WORKERS_FILES", 6)) as ex:
         futs = [
-            ex.submit(_process_file, base_input, out_root, p, translator, write, log)
-            for p in candidates
+            ex.submit(
+                _process_file, base_input, out_root, p, translator, write, log,
+                out_index, p_norm,
+            )
+            for p, p_norm in candidates
         ]
         for f in as_completed(futs):
             try:
@@ -368,24 +483,33 @@ def mirror_translate_dir(
             else:
                 tick(1, 0, 0, 0)
 
-    # 4) Последовательно JAR-моды
+    # 4) JAR-моды — тоже пулом: чтение zip и ожидание переводчика (сеть /
+    #    llama-server) перекрываются между модами, как и в фазе файлов.
     # R-1: раньше здесь вызывался несуществующий jar_lang.process_jar(...) с
     #      неправильной сигнатурой → перевод lang внутри .jar всегда падал в
     #      except. Корректная функция — process_jar_lang(jar_path, out_root, ...).
-    for jp in jar_ready:
-        try:
-            jar_lang.process_jar_lang(
-                jp,
-                out_root,
-                translator,
-                log=log,
-                write=write,
-                target_lang=config.TARGET_LANG,
-            )
-            tick(1, 1, 0, 0)
-        except Exception as e:
-            log(f"[ERR][jar] {os.path.basename(jp)}: {e}")
-            tick(1, 0, 1, 0)
+    if jar_ready:
+        with ThreadPoolExecutor(max_workers=getattr(config, "MAX_WORKERS_JARS", 4)) as jex:
+            jar_futs = {
+                jex.submit(
+                    jar_lang.process_jar_lang,
+                    jp,
+                    out_root,
+                    translator,
+                    log=log,
+                    write=write,
+                    target_lang=config.TARGET_LANG,
+                ): jp
+                for jp in jar_ready
+            }
+            for f in as_completed(jar_futs):
+                try:
+                    f.result()
+                except Exception as e:
+                    log(f"[ERR][jar] {os.path.basename(jar_futs[f])}: {e}")
+                    tick(1, 0, 1, 0)
+                    continue
+                tick(1, 1, 0, 0)
 
     # R-6: гарантируем финальную запись дебаунс-кэша
     try:
@@ -0,0 +1,64 @@
+# src/processors/_tcache.py
+"""
+Память переводов уровня процессоров: (text, target_lang) → перевод.
+
+Одни и те же строки («Iron Ingot», «Complete the quest», общие тултипы)
+повторяются в десятках файлов и jar'ов. Мемо живёт на объекте переводчика
+(атрибут _memo) — переживает запуски, пока GUI переиспользует Translator, и
+обходится без проверок/замка TranslationCache. Размер ограничен
+config.PROCESSOR_MEMO_MAX: при переполнении мемо просто очищается.
+
+Запоминаются только настоящие переводы (out != text): исходник переводчик
+возвращает и при окончательном сетевом сбое, а такой результат не должен
+пережить запуск — иначе строка так и останется английской до перезапуска.
+"""
+from __future__ import annotations
+
+from typing import Dict, List, Tuple
+
+from .. import config
+
+
+def memo_of(translator) -> Dict[Tuple[str, str], str]:
+    memo = getattr(translator, "_memo", None)
+    if memo is None:
+        memo = translator._memo = {}
+    return memo
+
+
+def _remember(memo: dict, items) -> None:
+    if len(memo) >= getattr(config, "PROCESSOR_MEMO_MAX", 65536):
+        memo.clear()
+    memo.update(items)
+
+
+def cached_translate(translator, text: str, target_lang: str) -> str:
+    """translator.translate через мемо."""
+    memo = memo_of(translator)
+    out = memo.get((text, target_lang))
+    if out is None:
+        out = translator.translate(text, target_lang=target_lang)
+        if out != text:
+            _remember(memo, (((text, target_lang), out),))
+    return out
+
+
+def translate_many(translator, texts: List[str], target_lang: str) -> List[str]:
+    """
+    translator.translate_many через мемо: в переводчик уходят только
+    уникальные промахи, ответ собирается в исходном порядке.
+    """
+    memo = memo_of(translator)
+    got: Dict[str, str] = {}
+    misses: List[str] = []
+    for t in dict.fromkeys(texts):
+        out = memo.get((t, target_lang))
+        if out is None:
+            misses.append(t)
+        else:
+            got[t] = out
+    if misses:
+        fresh = dict(zip(misses, translator.translate_many(misses, target_lang=target_lang)))
+        got.update(fresh)
+        _remember(memo, (((t, target_lang), o) for t, o in fresh.items() if o != t))
+    return [got.get(t, t) for t in texts]
@@ -1,18 +1,26 @@
 # src/processors/ftb_snbt.py
 from __future__ import annotations
 
+import io
 import re
 
 from .. import config
-from ..utils.helpers import ensure_dir_for_file, is_probably_text
+from . import _tcache
+from ..utils.helpers import (
+    ensure_dir_for_file,
+    escape_quoted,
+    is_probably_text,
+    read_text_lf,
+    unescape_quoted,
+    write_text_lf,
+)
 
 # ---------- строковые токены ----------
 
-# Именованный токен — когда реально переводим строку
-_STR_TOKEN = r'(?P<q>["\'])(?P<txt>(?:\\.|(?!\1).)*?)\1'
-
-# Неименованный токен — для общих паттернов
-_STR_TOKEN_NC = r'(?:"(?:\\.|[^"])*"|\'(?:\\.|[^\'])*\')'
+# Литерал в кавычках. Альтернативы не пересекаются («\» — только начало
+# экранирования): у прежнего (?:\\.|[^"])* обе ветки брали «\», и на
+# незакрытой строке с длинной серией «\» перебор рос экспоненциально.
+_STR_TOKEN_NC = r'(?:"(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\')'
 
 # Список строк вида ["a","b", ...]
 _LIST_OF_STRINGS_NC = (
@@ -23,108 +31,152 @@ _LIST_OF_STRINGS_NC = (
 _KEYS = tuple(sorted(config.FTB_TEXT_KEYS))
 _KEYS_RE = r'(?P<key>' + '|'.join(map(re.escape, _KEYS)) + r')'
 
+# Дешёвый префильтр: если ни одной подстроки-ключа в файле нет, регэксп не
+# гоняем. Ключи, содержащие другой ключ («subtitle» ⊃ «title», «book_text» ⊃
+# «text»), проверять отдельно незачем.
+_KEY_PROBES = tuple(k for k in _KEYS if not any(o != k and o in k for o in _KEYS))
+
 # key : "str" | 'str' | ["a","b",...]
 _FIELD_PATTERN = re.compile(
     _KEYS_RE + r'\s*:\s*(?P<val>(' + _STR_TOKEN_NC + r')|(' + _LIST_OF_STRINGS_NC + r'))',
     flags=re.DOTALL,
 )
 
-# Для прохода по списку строк
-_STR_IN_LIST = re.compile(_STR_TOKEN, flags=re.DOTALL)
-
 # ---------- экранирование ----------
 
-def _unescape(s: str, quote: str) -> str:
-    s = s.replace(r'\\', '\\')
-    if quote == '"':
-        s = s.replace(r'\"', '"')
-    else:
-        s = s.replace(r"\'", "'")
-    return s
-
-
-def _escape(s: str, quote: str) -> str:
-    s = s.replace('\\', r'\\')
-    if quote == '"':
-        s = s.replace('"', r'\"')
-    else:
-        s = s.replace("'", r"\'")
-    return s
+# общие реализации (str.translate / одна регулярка) — см. utils.helpers
+_unescape = unescape_quoted
+_escape = escape_quoted
 
 
 # ---------- перевод отдельной строки ----------
 
-def _translate_scalar(s: str, translator) -> str:
+# Заведомо не текст: id предмета (modid:path), цвет #RGB…, голые §-коды и
+# пробелы. Проверяем по сырому литералу ДО unescape: в таких строках нет ни
+# «\», ни кавычек, так что сырой вид и есть итоговый.
+_FAST_NONTEXT = re.compile(
+    r'(?:\s|§[0-9a-fk-or])*'
+    r'(?:[a-z0-9_.-]+:[a-z0-9_./-]+|#[0-9a-f]{3,8})?'
+    r'(?:\s|§[0-9a-fk-or])*',
+    flags=re.IGNORECASE,
+)
+
+def _wants_translation(s: str) -> bool:
     """
-    Консервативный перевод одиночной строки из .snbt:
+    Консервативный фильтр одиночной строки из .snbt:
     - пропускаем пустое
     - пропускаем явно нетекстовое по эвристике is_probably_text
-    - остальное отправляем в переводчик
-    """
-    if not s.strip():
-        return s
-
-    if not is_probably_text(s, config.SAFE_MAX_LEN):
-        return s
-
-    return translator.translate(s, target_lang=config.TARGET_LANG)
-
-
-def _translate_str_token(m: re.Match, translator) -> str:
-    q = m.group('q')
-    raw = m.group('txt')
-    plain = _unescape(raw, q)
-    out = _translate_scalar(plain, translator)
-    return f'{q}{_escape(out, q)}{q}'
-
-
-def _translate_list_of_strings(s: str, translator) -> str:
     """
-    Перевод списка строк ["...", "..."] — обрабатываем каждый элемент.
-    """
-    def repl(mm: re.Match) -> str:
-        return _translate_str_token(mm, translator)
-
-    return _STR_IN_LIST.sub(repl, s)
+    return bool(s.strip()) and is_probably_text(s, config.SAFE_MAX_LEN)
 
 
-def _translate_field_value(val_text: str, translator) -> str:
+def _iter_value_literals(text: str, vs: int, ve: int):
     """
-    Перевод значения текстового поля FTB:
+    Строковые литералы значения текстового поля FTB (text[vs:ve] — группа val
+    _FIELD_PATTERN) как (start, end, кавычка, сырой текст); start/end — границы
+    литерала с кавычками, абсолютные позиции в text. Подстроку значения не
+    вырезаем — работаем по позициям:
       - одиночная строка
       - список строк
-    Остальное не трогаем.
     """
-    vt = val_text.strip()
-    if not vt:
-        return val_text
-
-    # одиночный литерал?
-    if (vt.startswith('"') and vt.endswith('"')) or (vt.startswith("'") and vt.endswith("'")):
-        m = re.fullmatch(_STR_TOKEN, vt, flags=re.DOTALL)
-        return _translate_str_token(m, translator) if m else val_text
+    q = text[vs]
+    if q == '"' or q == "'":
+        # значение уже совпало с _STR_TOKEN_NC целиком — это ровно один
+        # литерал, границы известны без ещё одного регэкспа
+        yield vs, ve, q, text[vs + 1:ve - 1]
+        return
+    yield from _iter_list_literals(text, vs + 1, ve)
 
-    # список строк?
-    if vt.startswith('[') and vt.endswith(']'):
-        return _translate_list_of_strings(val_text, translator)
 
-    # прочие конструкции не трогаем
-    return val_text
+def _iter_list_literals(s: str, j: int, end: int):
+    """
+    Литералы списка строк s[j:end] линейным проходом на str.find. Значение уже
+    совпало с _LIST_OF_STRINGS_NC, так что между литералами — только запятые и
+    пробелы, а каждая кавычка закрыта; регэксп по списку второй раз не гоняем.
+    """
+    find = s.find
+    while True:
+        dq = find('"', j, end)
+        sq = find("'", j, end)
+        if dq == -1 and sq == -1:
+            return
+        a = sq if dq == -1 or (sq != -1 and sq < dq) else dq
+        q = s[a]
+        k = a + 1
+        while True:
+            e = find(q, k, end)
+            if e == -1:
+                return
+            bs = find('\\', k, e)
+            if bs == -1:
+                break
+            k = bs + 2  # экранированный символ (в т.ч. кавычка) — пропускаем
+        yield a, e + 1, q, s[a + 1:e]
+        j = e + 1
+
+
+def _scan_literals(text: str):
+    """
+    Литералы текстовых полей: список (abs_start, abs_end, кавычка, plain,
+    переводить?) и словарь plain → переводить? по уникальным строкам (в порядке
+    первого появления).
+    """
+    spans: list = []
+    wanted: dict = {}
+    if not any(k in text for k in _KEY_PROBES):
+        return spans, wanted
+    for m in _FIELD_PATTERN.finditer(text):
+        vs, ve = m.span('val')
+        for a, b, q, raw in _iter_value_literals(text, vs, ve):
+            if _FAST_NONTEXT.fullmatch(raw):
+                spans.append((a, b, q, raw, False))
+                continue
+            plain = _unescape(raw, q)
+            want = wanted.get(plain)
+            if want is None:
+                want = wanted[plain] = _wants_translation(plain)
+            spans.append((a, b, q, plain, want))
+    return spans, wanted
+
+
+def collect_ftb_snbt_strings(text: str) -> list:
+    """Уникальные строки текстовых полей, которые пошли бы в перевод (dry-run)."""
+    _spans, wanted = _scan_literals(text)
+    return [s for s, want in wanted.items() if want]
 
 
 def translate_ftb_snbt_text(text: str, translator) -> str:
     """
     Переводит только поля с ключами из config.FTB_TEXT_KEYS.
     Остальной SNBT остаётся неизменным.
-    """
-    def repl(m: re.Match) -> str:
-        start, _ = m.span('val')
-        g0 = m.group(0)
-        new_val = _translate_field_value(m.group('val'), translator)
-        # подменяем только кусок значения, остальное (ключ, двоеточие) оставляем как было
-        return g0[: start - m.start()] + new_val
 
-    return _FIELD_PATTERN.sub(repl, text)
+    Один проход регэкспа: собираем литералы текстовых полей (с позициями) и все
+    уникальные строки переводим ОДНИМ translate_many; затем склеиваем результат
+    в StringIO из кусков исходника между литералами — без вложенных re.sub.
+    """
+    spans, wanted = _scan_literals(text)
+    if not spans:
+        return text
+
+    pending = [s for s, want in wanted.items() if want]
+    tr = dict(zip(pending, _tcache.translate_many(translator, pending, config.TARGET_LANG)))
+
+    # сборка: исходник между литералами + переведённые литералы
+    buf = io.StringIO()
+    last = 0
+    for a, b, q, plain, want in spans:
+        if not want:
+            continue  # литерал остаётся как в исходнике, вместе с окружением
+        out = tr.get(plain, plain)
+        if out == plain:
+            continue  # перевод не изменил строку — без повторного экранирования
+        buf.write(text[last:a])
+        buf.write(f'{q}{_escape(out, q)}{q}')
+        last = b
+    if not last:
+        return text
+    buf.write(text[last:])
+    return buf.getvalue()
 
 
 def translate_ftb_snbt_file(src_path: str, dst_path: str, translator) -> None:
@@ -134,8 +186,7 @@ def translate_ftb_snbt_file(src_path: str, dst_path: str, translator) -> None:
       - если что-то пошло не так — логирует caller, а мы просто
         сохраняем исходное содержимое (английский, но файл целый)
     """
-    with open(src_path, "r", encoding="utf-8") as f:
-        data = f.read()
+    data = read_text_lf(src_path)
 
     try:
         out = translate_ftb_snbt_text(data, translator)
@@ -145,10 +196,8 @@ def translate_ftb_snbt_file(src_path: str, dst_path: str, translator) -> None:
         out = data
 
     ensure_dir_for_file(dst_path)
-    with open(dst_path, "w", encoding="utf-8", newline="\n") as f:
-        f.write(out)
+    write_text_lf(dst_path, out)
 
 
-# Алиас, который ищет mirrorer
-def translate_snbt_file(src_path: str, dst_path: str, translator) -> None:
-    translate_ftb_snbt_file(src_path, dst_path, translator)
\ No newline at end of file
+# Алиас старого имени (внешние вызовы); отдельная функция-обёртка не нужна
+translate_snbt_file = translate_ftb_snbt_file
\ No newline at end of file
@@ -1,46 +1,78 @@
 # src/processors/generic_json.py
 from __future__ import annotations
-import json
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List
 from ..utils.helpers import is_probably_text, ensure_dir_for_file
+from ..utils import json_fast
 from .. import config
+from . import _tcache
 
 
-def _translate_value(val: Any, key_hint: str, translator):
+# Два прохода в одном порядке обхода: _collect_* собирает строки под перевод
+# и решение «переводить?» для КАЖДОЙ встреченной строки, _rebuild_* по этим
+# решениям подставляет ответы одного translate_many — ключи и эвристика
+# во втором проходе уже не считаются.
+
+def _collect_value(val: Any, key_hint: str, acc: List[str], picks: List[bool]) -> None:
     if isinstance(val, str):
         # Для JSON-описаний переводим:
         #   – если ключ "похож" на текстовый
         #   – ИЛИ если сама строка очень похожа на обычный текст
-        if (key_hint in config.GENERIC_TEXT_KEYS or
-                is_probably_text(val, config.SAFE_MAX_LEN)):
-            return translator.translate(val, target_lang=config.TARGET_LANG)
-        return val
+        want = key_hint in _TEXT_KEYS or is_probably_text(val, _SAFE_MAX_LEN)
+        picks.append(want)
+        if want:
+            acc.append(val)
+    elif isinstance(val, list):
+        for item in val:
+            _collect_value(item, key_hint, acc, picks)
+    elif isinstance(val, dict):
+        _collect_obj(val, acc, picks)
+
+
+def _collect_obj(obj: Dict[str, Any], acc: List[str], picks: List[bool]) -> None:
+    for k, v in obj.items():
+        # ключи из JSON — всегда str, str(k) не нужен
+        _collect_value(v, k.lower(), acc, picks)
+
+
+def _rebuild_value(val: Any, picks: Iterator[bool], outs: Iterator[str]):
+    if isinstance(val, str):
+        return next(outs) if next(picks) else val
 
     if isinstance(val, list):
-        return [_translate_value(item, key_hint, translator) for item in val]
+        return [_rebuild_value(item, picks, outs) for item in val]
 
     if isinstance(val, dict):
-        return _translate_obj(val, translator)
+        return _rebuild_obj(val, picks, outs)
 
     return val
 
 
-def _translate_obj(obj: Dict[str, Any], translator):
+def _rebuild_obj(obj: Dict[str, Any], picks: Iterator[bool], outs: Iterator[str]):
     out: Dict[str, Any] = {}
     for k, v in obj.items():
-        key_hint = str(k).lower()
-        out[k] = _translate_value(v, key_hint, translator)
+        out[k] = _rebuild_value(v, picks, outs)
     return out
 
 
+# константы эвристики — один раз на модуль, а не атрибутом config на строку
+_TEXT_KEYS = config.GENERIC_TEXT_KEYS
+_SAFE_MAX_LEN = config.SAFE_MAX_LEN
+
+
+def _translate_obj(obj: Dict[str, Any], translator):
+    acc: List[str] = []
+    picks: List[bool] = []
+    _collect_obj(obj, acc, picks)
+    outs = _tcache.translate_many(translator, acc, config.TARGET_LANG) if acc else []
+    return _rebuild_obj(obj, iter(picks), iter(outs))
+
+
 def translate_generic_json_file(src_path: str, dst_path: str, translator) -> None:
-    with open(src_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    data = json_fast.load_path(src_path)
 
     result = _translate_obj(data, translator)
     ensure_dir_for_file(dst_path)
 
-    with open(dst_path, "w", encoding="utf-8") as f:
-        json.dump(result, f, ensure_ascii=False, indent=2)
+    json_fast.dump_path(dst_path, result)
 
     print(f"[OK][generic_json] {src_path} -> {dst_path}")
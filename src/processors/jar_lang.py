@@ -1,27 +1,120 @@
 # src/processors/jar_lang.py
 from __future__ import annotations
 import os
-import io
-import json
+import shutil
+import hashlib
 import zipfile
-from typing import Callable, Optional
+from typing import Callable, Iterator, Optional
+from concurrent.futures import ThreadPoolExecutor
 
 from .. import config
-from ..utils.helpers import ensure_dir_for_file
-
-
-def _translate_lang_dict(data: dict, translator, target_lang: str) -> dict:
-    out = {}
-    for k, v in data.items():
-        if isinstance(v, str):
-            try:
-                out[k] = translator.translate(v, target_lang=target_lang)
-            except Exception:
-                # если переводчик упал на конкретной строке — оставим оригинал
-                out[k] = v
+from . import lang_json
+from ..utils.helpers import atomic_write_bytes, ensure_dir_for_file
+from ..utils import json_fast
+
+
+def is_en_us_lang(member: str) -> bool:
+    """Член архива вида assets/<modid>/lang/en_us.json."""
+    m = member.replace("\\", "/")
+    return m.startswith("assets/") and m.endswith("/lang/en_us.json")
+
+
+def iter_lang_members(zf: zipfile.ZipFile) -> Iterator[zipfile.ZipInfo]:
+    """lang/en_us.json уже открытого архива — один проход по infolist()."""
+    for info in zf.infolist():
+        if not info.is_dir() and is_en_us_lang(info.filename):
+            yield info
+
+
+def jar_has_lang(jar_path: str) -> bool:
+    """Есть ли в .jar хоть один lang/en_us.json (тот же критерий, что и у перевода)."""
+    try:
+        with zipfile.ZipFile(jar_path, "r") as zf:
+            return next(iter_lang_members(zf), None) is not None
+    except (zipfile.BadZipFile, OSError):
+        return False
+
+
+def _file_cache_path(raw: bytes, target_lang: str, translator) -> Optional[str]:
+    """
+    Файл готового перевода для этого содержимого en_us.json (или None).
+    В ключе — и «чем переводили» (backend_id: провайдер, модель, strict):
+    перевод одной модели не должен подставляться при работе с другой.
+    """
+    if not getattr(config, "JAR_LANG_FILE_CACHE", False):
+        return None
+    h = hashlib.blake2b(raw, digest_size=16)
+    h.update(b"\0" + target_lang.encode("utf-8"))
+    h.update(b"\0" + str(getattr(translator, "backend_id", "")).encode("utf-8"))
+    return os.path.join(config.JAR_LANG_CACHE_DIR, target_lang, h.hexdigest() + ".json")
+
+
+def _process_member(
+    jar_path: str,
+    member: str,
+    raw: bytes,
+    out_root: str,
+    translator,
+    log: Callable[[str], None],
+    write: bool,
+    target_lang: str,
+) -> bool:
+    """Перевод одного lang-файла из архива (уже прочитанные bytes)."""
+    # путь вывода: out_root/jar/<jarname>/<assets/.../lang/ru_ru.json>
+    jarname = os.path.splitext(os.path.basename(jar_path))[0]
+    rel_ru = member.replace("/en_us.json", f"/{target_lang}.json")
+    dst_path = os.path.join(out_root, "jar_lang", jarname, rel_ru)
+
+    # тот же en_us.json уже переводили (другой модпак / прошлый запуск)
+    cache_path = _file_cache_path(raw, target_lang, translator)
+    if cache_path and os.path.isfile(cache_path):
+        if write:
+            ensure_dir_for_file(dst_path)
+            shutil.copyfile(cache_path, dst_path)
+            log(f"[OK][jar-cache] {os.path.basename(jar_path)}:{member} → {os.path.relpath(dst_path, out_root)}")
         else:
-            out[k] = v
-    return out
+            log(f"[dry][jar-cache] {os.path.basename(jar_path)}:{member} → {rel_ru}")
+        return True
+
+    # читаем JSON
+    try:
+        data = json_fast.loads(raw)
+        if not isinstance(data, dict):
+            log(f"[LWRN][jar] {os.path.basename(jar_path)}:{member}: not an object, skip")
+            return False
+    except Exception as e:
+        log(f"[LWRN][jar] {os.path.basename(jar_path)}:{member}: bad json: {e}")
+        return False
+
+    # перевод
+    failures = getattr(translator, "failures", 0)
+    try:
+        # одна пачка на файл (общий translate_lang_values с lang_json)
+        translated = lang_json.translate_lang_values(data, translator, target_lang)
+        complete = True
+    except Exception:
+        # если переводчик упал на пачке — оставим оригиналы
+        translated = dict(data)
+        complete = False
+
+    # в файловый кэш — только при записи и только полный перевод: если хоть
+    # одна строка вернулась исходником из-за сбоя (счётчик failures вырос —
+    # возможно, и чужой сбой того же переводчика: лишний промах не страшен),
+    # такой файл не должен «залипнуть» на следующие запуски
+    complete = complete and getattr(translator, "failures", 0) == failures
+    if write and cache_path and complete and translated != data:
+        try:
+            atomic_write_bytes(cache_path, json_fast.dumps_pretty(translated))
+        except OSError:
+            pass
+
+    if write:
+        ensure_dir_for_file(dst_path)
+        json_fast.dump_path(dst_path, translated)
+        log(f"[OK][jar] {os.path.basename(jar_path)}:{member} → {os.path.relpath(dst_path, out_root)}")
+    else:
+        log(f"[dry][jar] {os.path.basename(jar_path)}:{member} → {rel_ru}")
+    return True
 
 
 def process_jar_lang(
@@ -41,57 +134,31 @@ def process_jar_lang(
     jar_path = os.path.abspath(jar_path)
     out_root = os.path.abspath(out_root)
 
-    processed = 0
-
-    # пример члена архива: assets/modid/lang/en_us.json
-    def _is_en_us_lang(member: str) -> bool:
-        m = member.replace("\\", "/")
-        return m.startswith("assets/") and m.endswith("/lang/en_us.json")
-
     try:
+        # zip читаем последовательно (это быстро), а перевод и запись — самое
+        # долгое — для нескольких lang-файлов одного мода идут параллельно
+        entries = []
         with zipfile.ZipFile(jar_path, "r") as zf:
-            members = [m for m in zf.namelist() if _is_en_us_lang(m)]
-            if not members:
-                return 0
-
-            for member in members:
-                try:
-                    raw = zf.read(member)
-                except KeyError:
-                    # внезапно нет — пропустим
-                    continue
-
-                # читаем JSON
-                try:
-                    data = json.loads(raw.decode("utf-8"))
-                    if not isinstance(data, dict):
-                        log(f"[LWRN][jar] {os.path.basename(jar_path)}:{member}: not an object, skip")
-                        continue
-                except Exception as e:
-                    log(f"[LWRN][jar] {os.path.basename(jar_path)}:{member}: bad json: {e}")
-                    continue
-
-                # перевод
-                translated = _translate_lang_dict(data, translator, target_lang)
-
-                # путь вывода: out_root/jar/<jarname>/<assets/.../lang/ru_ru.json>
-                jarname = os.path.splitext(os.path.basename(jar_path))[0]
-                rel_ru = member.replace("/en_us.json", f"/{target_lang}.json")
-                dst_path = os.path.join(out_root, "jar_lang", jarname, rel_ru)
-
-                if write:
-                    ensure_dir_for_file(dst_path)
-                    with open(dst_path, "w", encoding="utf-8", newline="\n") as f:
-                        json.dump(translated, f, ensure_ascii=False, indent=2)
-                    log(f"[OK][jar] {os.path.basename(jar_path)}:{member} → {os.path.relpath(dst_path, out_root)}")
-                else:
-                    log(f"[dry][jar] {os.path.basename(jar_path)}:{member} → {rel_ru}")
-
-                processed += 1
+            for info in iter_lang_members(zf):
+                entries.append((info.filename, zf.read(info)))
+        if not entries:
+            return 0
+
+        def _one(entry) -> bool:
+            member, raw = entry
+            return _process_member(
+                jar_path, member, raw, out_root, translator, log, write, target_lang
+            )
+
+        if len(entries) == 1:
+            return int(_one(entries[0]))
+        workers = min(len(entries), getattr(config, "MAX_WORKERS_JAR_MEMBERS", 4))
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            return sum(ex.map(_one, entries))
 
     except zipfile.BadZipFile:
         log(f"[LWRN][jar] {os.path.basename(jar_path)}: BadZipFile, skip")
     except Exception as e:
         log(f"[ERR][jar] {os.path.basename(jar_path)}: {e}")
 
-    return processed
+    return 0
@@ -1,7 +1,8 @@
 from __future__ import annotations
 import re
-from ..utils.helpers import ensure_dir_for_file
+from ..utils.helpers import ensure_dir_for_file, escape_quoted, unescape_quoted, read_text_lf, write_text_lf
 from .. import config
+from . import _tcache
 
 # функции/методы, в которых безопасно переводить 1-й строковый аргумент
 _FUNCS = (
@@ -13,65 +14,85 @@ _FUNCS = (
     r"sendMessage",
 )
 
-# "..." | '...'  (с экранированием)
-_STR = r'(?P<q>["\'])(?P<txt>(?:\\.|(?!\1).)*?)\1'
-# `...` без шаблонов ${...}
-_TPL = r'`(?P<btxt>(?:\\.|(?!`).)*?)`'
+# быстрый отсев подстрокой до регулярки: без этих имён _CALL_RE не найдёт
+# ничего (player.tell/server.tell покрываются "tell")
+_FUNC_PROBES = ("Text.of", "tell", "console.log", "sendMessage")
+
+# "..." | '...' | `...` — у каждого вида своя именованная группа, тело без
+# неоднозначных альтернатив (нет отката); вид кавычки — по сработавшей группе
+_STR = r'"(?P<dq>(?:[^"\\]|\\.)*)"|\'(?P<sq>(?:[^\'\\]|\\.)*)\''
+_TPL = r'`(?P<bt>(?:[^`\\]|\\.)*)`'
 
 # fn(<строка|бэктик>, ...)
 _CALL_RE = re.compile(
-    r'(?P<fn>(' + "|".join(_FUNCS) + r'))\s*\(\s*(?P<val>' + _STR + r'|' + _TPL + r')',
+    r'(?P<fn>' + "|".join(_FUNCS) + r')\s*\(\s*(?P<val>' + _STR + r'|' + _TPL + r')',
     flags=re.DOTALL,
 )
 
-def _unescape(s: str, quote: str) -> str:
-    s = s.replace(r'\\', '\\')
-    if quote == '"':
-        s = s.replace(r'\"', '"')
-    else:
-        s = s.replace(r"\'", "'")
-    return s
+# общие реализации (str.translate / одна регулярка) — см. utils.helpers
+_unescape = unescape_quoted
+_escape = escape_quoted
+_ESC_TPL = str.maketrans({'\\': r'\\', '`': r'\`'})
+
+def _literal_payload(m: re.Match):
+    """
+    Совпадение _CALL_RE → (открывающая кавычка, текст для перевода) или None,
+    если трогать нельзя (шаблон с ${...}). Повторный match не нужен: всё
+    нужное уже лежит в группах.
+    """
+    txt = m.group('dq')
+    if txt is not None:
+        return '"', _unescape(txt, '"')
+    txt = m.group('sq')
+    if txt is not None:
+        return "'", _unescape(txt, "'")
+    raw = m.group('bt')  # `...` без ${}
+    if "${" in raw:
+        return None
+    return '`', raw
+
 
-def _escape(s: str, quote: str) -> str:
-    s = s.replace('\\', r'\\')
-    if quote == '"':
-        s = s.replace('"', r'\"')
-    else:
-        s = s.replace("'", r"\'")
-    return s
+def _render_literal(q: str, out: str) -> str:
+    if q == '`':
+        return f'`{out.translate(_ESC_TPL)}`'
+    return f'{q}{_escape(out, q)}{q}'
 
-def _translate_literal(m: re.Match, translator) -> str:
-    if m.groupdict().get('q'):  # "..." | '...'
-        q = m.group('q'); raw = m.group('txt')
-        plain = _unescape(raw, q)
-        out = translator.translate(plain, target_lang=config.TARGET_LANG)
-        return f'{q}{_escape(out, q)}{q}'
-    else:                       # `...` без ${}
-        raw = m.group('btxt')
-        if "${" in raw:
-            return f'`{raw}`'
-        out = translator.translate(raw, target_lang=config.TARGET_LANG)
-        out = out.replace('\\', r'\\').replace('`', r'\`')
-        return f'`{out}`'
 
 def translate_kubejs_script_text(text: str, translator) -> str:
-    def repl(m: re.Match) -> str:
-        lit = m.group('val')
-        sub = re.match(r'^' + _STR + r'$|^' + _TPL + r'$', lit, flags=re.DOTALL)
-        if not sub:
-            return m.group(0)
-        new_lit = _translate_literal(sub, translator)
-        # заменить только сам аргумент
-        return m.group(0)[: m.start('val') - m.start()] + new_lit
-    return _CALL_RE.sub(repl, text)
+    """
+    Два прохода: собираем аргументы-литералы всех вызовов _FUNCS, переводим
+    их одним translate_many и склеиваем текст, заменяя только сами аргументы.
+    """
+    if not any(f in text for f in _FUNC_PROBES):
+        return text
+    jobs = []  # (start, end, кавычка, текст)
+    for m in _CALL_RE.finditer(text):
+        payload = _literal_payload(m)
+        if payload is not None:
+            jobs.append((m.start('val'), m.end('val')) + payload)
+    if not jobs:
+        return text
+
+    outs = _tcache.translate_many(translator, [j[3] for j in jobs], config.TARGET_LANG)
+
+    parts = []
+    last = 0
+    for (a, b, q, plain), out in zip(jobs, outs):
+        if out == plain:
+            continue  # не изменился — литерал остаётся как в исходнике
+        parts.append(text[last:a])
+        parts.append(_render_literal(q, out))
+        last = b
+    if not last:
+        return text
+    parts.append(text[last:])
+    return "".join(parts)
 
 def translate_kubejs_script_file(src: str, dst: str, translator) -> None:
-    with open(src, "r", encoding="utf-8") as f:
-        data = f.read()
+    data = read_text_lf(src)
     out = translate_kubejs_script_text(data, translator)
     ensure_dir_for_file(dst)
-    with open(dst, "w", encoding="utf-8", newline="\n") as f:
-        f.write(out)
+    write_text_lf(dst, out)
 
 # ✅ Алиас под вызов из mirrorer — именно его ищет код
 def process_kubejs_script(src: str, dst: str, translator) -> None:
@@ -1,35 +1,38 @@
 # src/processors/lang_json.py
 from __future__ import annotations
-import json
+from typing import Optional
+
 from .. import config
+from . import _tcache
 from ..utils.helpers import ensure_dir_for_file
+from ..utils import json_fast
 
 
-def translate_lang_json(src_path: str, dst_path: str, translator) -> None:
+def translate_lang_values(data: dict, translator, target_lang: Optional[str] = None) -> dict:
     """
-    Прямой перевод файла lang/en_us.json -> ru_ru.json на диске.
-    Переводим ВСЕ строковые значения.
+    Копия dict с переведёнными строковыми значениями. Повторы («Air», общие
+    описания чар) в переводчик уходят один раз: _tcache шлёт только
+    уникальные строки и раскладывает ответ обратно по ключам.
     """
-    with open(src_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    keys = []
-    values = []
     out_data = dict(data)
+    keys = [k for k, v in data.items() if isinstance(v, str)]
+    if keys:
+        outs = _tcache.translate_many(
+            translator, [data[k] for k in keys], target_lang or config.TARGET_LANG
+        )
+        out_data.update(zip(keys, outs))
+    return out_data
 
-    for k, v in data.items():
-        if isinstance(v, str):
-            keys.append(k)
-            values.append(v)
 
-    if values:
-        outs = translator.translate_many(values, target_lang=config.TARGET_LANG)
-        for k, translated in zip(keys, outs):
-            out_data[k] = translated
+def translate_lang_json(src_path: str, dst_path: str, translator) -> None:
+    """
+    Прямой перевод файла lang/en_us.json -> ru_ru.json на диске.
+    Переводим ВСЕ строковые значения.
+    """
+    out_data = translate_lang_values(json_fast.load_path(src_path), translator)
 
     ensure_dir_for_file(dst_path)
-    with open(dst_path, "w", encoding="utf-8") as f:
-        json.dump(out_data, f, ensure_ascii=False, indent=2)
+    json_fast.dump_path(dst_path, out_data)
     print(f"[OK][lang_json] {src_path} -> {dst_path}")
 
 
@@ -39,21 +42,9 @@ def translate_lang_obj(obj: dict, output_path: str, translator) -> None:
     и запись ru_ru.json.
     Переводим ВСЕ строковые значения.
     """
-    keys = []
-    values = []
-    out_data = dict(obj)
-
-    for k, v in obj.items():
-        if isinstance(v, str):
-            keys.append(k)
-            values.append(v)
-
-    if values:
-        outs = translator.translate_many(values, target_lang=config.TARGET_LANG)
-        for k, translated in zip(keys, outs):
-            out_data[k] = translated
+    out_data = translate_lang_values(obj, translator)
 
     ensure_dir_for_file(output_path)
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(out_data, f, ensure_ascii=False, indent=2)
+    json_fast.dump_path(output_path, out_data)
     print(f"[OK][lang_obj] saved: {output_path}")
+
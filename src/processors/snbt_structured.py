@@ -3,13 +3,16 @@ from __future__ import annotations
 
 import json
 import re
+from functools import lru_cache
 from typing import Sequence, Tuple, Optional
 
 import ftb_snbt_lib as slib
 from ftb_snbt_lib.tag import Compound, List as NbtList, String as StringTag
 
 from .. import config
-from ..utils.helpers import ensure_dir_for_file, is_probably_text
+from . import _tcache
+from ..utils.helpers import ensure_dir_for_file, is_probably_text, read_text_lf, write_text_lf
+from ..utils import json_fast
 
 # ---------- Minecraft форматирование (§) ----------
 
@@ -18,6 +21,9 @@ _MC_FORMAT_RE = re.compile(r'^(?:§.)+')
 # строки, похожие на resource-путь / ID: modid:path/like_this-123
 _RES_PATH_RE = re.compile(r'^[a-z0-9_./:-]+$')
 
+# строка похожа на chat JSON-компонент: '{' или '[' после пробелов
+_JSONISH_RE = re.compile(r'\s*[\{\[]')
+
 # ключи, которые почти всегда означают человекочитаемый текст
 _FORCED_TEXT_KEYS = {
     "title",
@@ -33,12 +39,36 @@ _FORCED_TEXT_KEYS = {
     "chapter_title",
 }
 
+# явно текстовые контейнеры где-либо на пути
+_TEXT_CONTAINERS = frozenset({"lore", "pages", "description", "subtitle", "title", "name"})
+
+# сугубо технические поля
+_TECHNICAL_KEYS = frozenset({
+    "id",
+    "filename",
+    "group",
+    "icon",
+    "order_index",
+    "quest_links",
+    "x",
+    "y",
+    "z",
+    "pos",
+    "size",
+    "color",
+    "background",
+    "shape",
+    "dimension",
+})
+
 
 def _split_minecraft_formatting(text: str) -> Tuple[str, str]:
     """
     '§7§o§e§oSome text' -> ('§7§o§e§o', 'Some text')
     'Some text'        -> ('', 'Some text')
     """
+    if not text.startswith("§"):  # коды только в начале — без регулярки
+        return "", text
     m = _MC_FORMAT_RE.match(text)
     if not m:
         return "", text
@@ -59,7 +89,7 @@ def _last_semantic_key(path: Sequence[str]) -> Optional[str]:
     return None
 
 
-def _is_path_force_text(path: Sequence[str]) -> bool:
+def _is_path_force_text(path: Tuple[str, ...]) -> bool:
     """
     Поля, которые почти гарантированно текстовые и должны переводиться
     даже если строка короткая.
@@ -72,14 +102,13 @@ def _is_path_force_text(path: Sequence[str]) -> bool:
         return True
 
     # если по пути встречаются явно текстовые контейнеры
-    text_containers = {"lore", "pages", "description", "subtitle", "title", "name"}
-    if any(seg.lower() in text_containers for seg in path):
+    if any(seg.lower() in _TEXT_CONTAINERS for seg in path):
         return True
 
     return False
 
 
-def _is_path_technical(path: Sequence[str]) -> bool:
+def _is_path_technical(path: Tuple[str, ...]) -> bool:
     """
     Очень мягкая фильтрация сугубо тех. полей.
     Всё, что может быть человекочитаемым (title, subtitle, description,
@@ -96,24 +125,7 @@ def _is_path_technical(path: Sequence[str]) -> bool:
 
     last_lower = last.lower()
 
-    technical_keys = {
-        "id",
-        "filename",
-        "group",
-        "icon",
-        "order_index",
-        "quest_links",
-        "x",
-        "y",
-        "z",
-        "pos",
-        "size",
-        "color",
-        "background",
-        "shape",
-        "dimension",
-    }
-    if last_lower in technical_keys:
+    if last_lower in _TECHNICAL_KEYS:
         return True
 
     # спец-кейс FTB Quests: tasks.*.type — это тип задачи, его нельзя переводить
@@ -124,6 +136,25 @@ def _is_path_technical(path: Sequence[str]) -> bool:
     return False
 
 
+# классы пути для _translate_plain_text
+_PATH_TECHNICAL = "T"
+_PATH_FORCED = "F"
+_PATH_NORMAL = ""
+
+
+@lru_cache(maxsize=4096)
+def _classify_path(path: Tuple[str, ...]) -> str:
+    """
+    Один кэшируемый вердикт на путь вместо двух проверок на каждый лист:
+    тех. поле важнее «явно текстового» — как и раньше в порядке проверок.
+    """
+    if _is_path_technical(path):
+        return _PATH_TECHNICAL
+    if _is_path_force_text(path):
+        return _PATH_FORCED
+    return _PATH_NORMAL
+
+
 # ---------- перевод обычного текста ----------
 
 def _translate_plain_text(text: str, translator, path: Sequence[str]) -> str:
@@ -141,13 +172,15 @@ def _translate_plain_text(text: str, translator, path: Sequence[str]) -> str:
     if not stripped:
         return text
 
+    cls = _classify_path(path)
+
     # 1) тех. поля (id, filename, tasks.*.type, и т.п.) — никогда не переводим
-    if _is_path_technical(path):
+    if cls == _PATH_TECHNICAL:
         return text
 
     # 2) Явно текстовые поля — переводим даже если строка короткая
-    if _is_path_force_text(path):
-        return translator.translate(text, target_lang=config.TARGET_LANG)
+    if cls == _PATH_FORCED:
+        return _tcache.cached_translate(translator, text, config.TARGET_LANG)
 
     # 3) Остальное: аккуратная эвристика
 
@@ -159,7 +192,7 @@ def _translate_plain_text(text: str, translator, path: Sequence[str]) -> str:
     if not is_probably_text(text, config.SAFE_MAX_LEN):
         return text
 
-    return translator.translate(text, target_lang=config.TARGET_LANG)
+    return _tcache.cached_translate(translator, text, config.TARGET_LANG)
 
 
 # ---------- перевод chat JSON-компонентов ----------
@@ -207,22 +240,42 @@ def _translate_chat_component(component, translator, path: Sequence[str]):
     return component
 
 
+def _has_strings(obj) -> bool:
+    """Есть ли в JSON-значении хоть одна строка-значение (ключи не в счёт)."""
+    stack = [obj]
+    pop, push = stack.pop, stack.extend
+    while stack:
+        n = pop()
+        if isinstance(n, str):
+            return True
+        if isinstance(n, dict):
+            push(n.values())
+        elif isinstance(n, list):
+            push(n)
+    return False
+
+
 def _try_translate_chat_json(text: str, translator, path: Sequence[str]) -> str | None:
     """
     Если строка похожа на JSON-компонент (начинается с '{' или '['),
     пробуем распарсить, рекурсивно перевести и собрать обратно.
     ЛЮБАЯ ошибка внутри → None (строка останется как есть).
     """
-    stripped = text.strip()
-    if not stripped:
-        return None
-
-    if not (stripped.startswith("{") or stripped.startswith("[")):
+    # отсев без .strip(): копию строки делаем только для JSON-кандидатов
+    if not _JSONISH_RE.match(text):
         return None
 
     try:
-        data = json.loads(stripped)
+        data = json_fast.loads(text.strip())
+        # ни одной строки внутри (только цвета-числа, bool и т.п.) — нечего
+        # переводить, копию компонента не строим
+        if not _has_strings(data):
+            return text
         translated = _translate_chat_component(data, translator, path)
+        if translated == data:
+            return text  # без изменений — оставляем исходную запись JSON
+        # запись — stdlib: разделители ", "/": " как раньше (orjson пишет
+        # без пробелов, а это лишний diff в каждой переведённой строке)
         return json.dumps(translated, ensure_ascii=False)
     except Exception:
         # Любая проблема с JSON → просто не трогаем эту строку
@@ -242,67 +295,124 @@ def _translate_string_value(value: str, translator, path: Sequence[str]) -> str:
     return _translate_plain_text(value, translator, path)
 
 
-# ---------- рекурсивный обход NBT-дерева ----------
+# ---------- обход NBT-дерева ----------
+
+def _translate_string_tag(tag, translator, path: Sequence[str]):
+    """String-тег → новый StringTag с переводом или тот же тег."""
+    original = str(tag)
+    try:
+        new_value = _translate_string_value(original, translator, path)
+    except Exception:
+        return tag  # на всякий пожарный
+
+    if new_value == original:
+        return tag  # без изменений
+
+    return StringTag(new_value)
+
+
+# теги, в которые обход заходит (остальное не переводится и не меняется)
+_WALKED = (Compound, NbtList, StringTag)
+
 
 def _translate_nbt_tag(tag, translator, path: Sequence[str] = ()):
     """
-    Рекурсивно обходим всё дерево:
+    Обходим всё дерево (явный стек, а не рекурсия — глубокие главы FTB
+    Quests не упираются в recursion limit):
       - Compound: по ключам
       - List: по элементам
-      - String: переводим
+      - String: переводим и кладём на место в родителя
       - остальные теги: не трогаем
 
     ЛЮБАЯ ошибка в обработке дочернего тега не роняет весь файл —
     просто оставляем этот конкретный узел как есть.
     """
-    # Compound = словарь тегов
-    if isinstance(tag, Compound):
-        for key in list(tag.keys()):  # фиксированный список ключей
-            child = tag[key]
-            child_path = path + (str(key),)
-            try:
-                tag[key] = _translate_nbt_tag(child, translator, child_path)
-            except Exception:
-                # Если конкретный ребёнок сломался — оставляем его как есть
-                tag[key] = child
-        return tag
-
-    # List = список тегов
-    if isinstance(tag, NbtList):
-        for i in range(len(tag)):
-            child = tag[i]
-            child_path = path + (f"[{i}]",)
-            try:
-                tag[i] = _translate_nbt_tag(child, translator, child_path)
-            except Exception:
-                tag[i] = child
-        return tag
-
-    # String = строка, которую мы хотим перевести
     if isinstance(tag, StringTag):
-        original = str(tag)
+        return _translate_string_tag(tag, translator, path)
+
+    # (родитель, ключ/индекс, узел, путь); дети кладутся в обратном порядке,
+    # чтобы обход шёл в порядке документа
+    stack = [(None, None, tag, tuple(path))]
+    pop, push = stack.pop, stack.append
+    shared = {}.setdefault
+    while stack:
+        parent, key, node, node_path = pop()
         try:
-            new_value = _translate_string_value(original, translator, path)
+            # путь-кортеж строим только детям, которых обход реально
+            # посетит: числа/массивы (большая часть листьев квестов) — мимо
+            if isinstance(node, Compound):
+                for k in reversed(list(node.keys())):  # фиксированный список ключей
+                    child = node[k]
+                    if isinstance(child, _WALKED):
+                        push((node, k, child, node_path + (str(k),)))
+            elif isinstance(node, NbtList):
+                for i in range(len(node) - 1, -1, -1):
+                    child = node[i]
+                    if isinstance(child, _WALKED):
+                        push((node, i, child, node_path + (f"[{i}]",)))
+            elif isinstance(node, StringTag) and parent is not None:
+                new_tag = _translate_string_tag(node, translator, node_path)
+                if new_tag is not node:
+                    # одинаковые переводы — один общий тег (String неизменяем)
+                    parent[key] = shared(new_tag, new_tag)
         except Exception:
-            return tag  # на всякий пожарный
-
-        if new_value == original:
-            return tag  # без изменений
-
-        return StringTag(new_value)
+            # Если конкретный ребёнок сломался — оставляем его как есть
+            continue
 
     # Всё остальное (числа, массивы и т.п.) — оставляем как есть
     return tag
 
 
+# ---------- пакетный перевод ----------
+
+class _Collector:
+    """
+    Переводчик-«сборщик» для первого прохода: запоминает строки, которые
+    обход отправил бы на перевод, и возвращает их без изменений (повторы
+    отсекает translate_many).
+    """
+
+    def __init__(self) -> None:
+        self.texts = []
+
+    def translate(self, text: str, target_lang: str = "") -> str:
+        self.texts.append(text)
+        return text
+
+
+class _Lookup:
+    """
+    Переводчик второго прохода: отдаёт ответы translate_many первого прохода,
+    незнакомые строки — как есть. Не через мемо _tcache: туда попадают только
+    настоящие переводы, и строка, вернувшаяся без изменений (сбой сети, имя
+    собственное), ушла бы в translator.translate повторно.
+    """
+
+    def __init__(self, table) -> None:
+        self.table = table
+
+    def translate(self, text: str, target_lang: str = "") -> str:
+        return self.table.get(text, text)
+
+
 # ---------- публичные функции ----------
 
 def translate_snbt_text_structured(text: str, translator) -> str:
     """
     SNBT → NBT → рекурсивный перевод строк → SNBT.
+
+    Два прохода по одному дереву: сборщик копит строки под перевод, они
+    уходят в переводчик одним translate_many, после чего обычный обход берёт
+    готовые переводы из его ответа.
     """
     root = slib.loads(text)  # Compound
-    root = _translate_nbt_tag(root, translator, path=())
+    collector = _Collector()
+    root = _translate_nbt_tag(root, collector, path=())
+    texts = collector.texts
+    table = {}
+    if texts:
+        table = dict(zip(texts, _tcache.translate_many(translator, texts, config.TARGET_LANG)))
+    root = _translate_nbt_tag(root, _Lookup(table), path=())
     return slib.dumps(root, comma_sep=False)
 
 
@@ -310,11 +420,9 @@ def translate_snbt_file_structured(src_path: str, dst_path: str, translator) ->
     """
     Читает SNBT, переводит структурно, сохраняет.
     """
-    with open(src_path, "r", encoding="utf-8") as f:
-        data = f.read()
+    data = read_text_lf(src_path)
 
     out = translate_snbt_text_structured(data, translator)
 
     ensure_dir_for_file(dst_path)
-    with open(dst_path, "w", encoding="utf-8", newline="\n") as f:
-        f.write(out)
+    write_text_lf(dst_path, out)
@@ -1,73 +1,111 @@
 # src/scanner.py
 from __future__ import annotations
 import os
-import json
+import re
 import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from .processors import lang_json, generic_json
 from .utils.helpers import ensure_dir_for_file
+from .utils import json_fast
 from . import config
 
+# assets/<modid>/lang/en_us.json внутри jar (в корне архива или глубже)
+_LANG_IN_JAR = re.compile(r"(?:^|/)assets/([^/]+)/lang/en_us\.json$")
 
-def _scan_patchouli_in_assets(assets_dir: str, out_root: str, translator, processed: int) -> int:
-    """assets/**/patchouli_books/**/en_us/**.json → .../ru_ru/..."""
+
+def _scan_assets(assets_dir: str, out_root: str, tasks: list) -> None:
+    """
+    Один os.walk по assets/ вместо трёх:
+      - assets/**/patchouli_books/**/en_us/**.json → .../ru_ru/...
+      - assets/**/tips/*.json → тот же путь
+      - assets/*/lang/en_us.json → ru_ru.json
+    """
     if not os.path.isdir(assets_dir):
-        return processed
+        return
+    slash = os.sep == "/"
     for root, _, files in os.walk(assets_dir):
-        root_norm = root.replace("\\", "/")
-        if "/patchouli_books/" in root_norm and "/en_us/" in root_norm:
-            for fname in files:
-                if not fname.endswith(".json"):
-                    continue
-                src_path = os.path.join(root, fname)
-                rel = os.path.relpath(src_path, start=assets_dir).replace("\\", "/")
+        # нормализуем один раз на каталог (на POSIX — без replace); «/» в
+        # конце — чтобы файлы прямо в tips/ и en_us/ тоже подходили
+        root_norm = (root if slash else root.replace("\\", "/")) + "/"
+        is_patchouli = "/patchouli_books/" in root_norm and "/en_us/" in root_norm
+        is_tips = "/tips/" in root_norm
+        is_lang = root_norm.endswith("/lang/") and "assets/" in root_norm
+        if not (is_patchouli or is_tips or is_lang):
+            continue
+
+        rel_root = os.path.relpath(root, start=assets_dir)
+        if not slash:
+            rel_root = rel_root.replace("\\", "/")
+        for fname in files:
+            if not fname.endswith(".json"):
+                continue
+            src_path = os.path.join(root, fname)
+            rel = fname if rel_root == "." else f"{rel_root}/{fname}"
+            if is_patchouli:
                 rel_ru = rel.replace("/en_us/", f"/{config.TARGET_LANG}/")
                 dst = os.path.join(out_root, "assets", rel_ru)
-                generic_json.translate_generic_json_file(src_path, dst, translator)
-                processed += 1
-                print(f"[OK] patchouli → {dst}")
-    return processed
-
-
-def _scan_tips_in_assets(assets_dir: str, out_root: str, translator, processed: int) -> int:
-    """assets/**/tips/*.json → тот же путь"""
-    if not os.path.isdir(assets_dir):
-        return processed
-    for root, _, files in os.walk(assets_dir):
-        root_norm = root.replace("\\", "/")
-        if "/tips/" in root_norm:
-            for fname in files:
-                if not fname.endswith(".json"):
-                    continue
-                src_path = os.path.join(root, fname)
-                rel = os.path.relpath(src_path, start=assets_dir).replace("\\", "/")
+                tasks.append((generic_json.translate_generic_json_file, src_path, dst, f"[OK] patchouli → {dst}"))
+            if is_tips:
                 dst = os.path.join(out_root, "assets", rel)
-                generic_json.translate_generic_json_file(src_path, dst, translator)
-                processed += 1
-                print(f"[OK] tips → {dst}")
-    return processed
-
-
-def _scan_lang_in_assets(assets_dir: str, out_root: str, translator, processed: int) -> int:
-    """assets/*/lang/en_us.json → ru_ru.json"""
-    if not os.path.isdir(assets_dir):
-        return processed
-    for root, _, files in os.walk(assets_dir):
-        root_norm = root.replace("\\", "/")
-        if root_norm.endswith("/lang") and "assets/" in root_norm:
-            for fname in files:
-                if fname != "en_us.json":
-                    continue
-                src_path = os.path.join(root, fname)
+                tasks.append((generic_json.translate_generic_json_file, src_path, dst, f"[OK] tips → {dst}"))
+            if is_lang and fname == "en_us.json":
                 parts = root_norm.split("/")
                 try:
                     modid = parts[parts.index("assets") + 1]
                 except Exception:
                     modid = "unknown_mod"
                 dst = os.path.join(out_root, "assets", modid, "lang", f"{config.TARGET_LANG}.json")
-                lang_json.translate_lang_json(src_path, dst, translator)
-                processed += 1
-                print(f"[OK] lang → {dst}")
+                tasks.append((lang_json.translate_lang_json, src_path, dst, f"[OK] lang → {dst}"))
+
+
+def _translate_jar_member(src: tuple, dst: str, translator) -> bool:
+    """
+    src = (путь к jar, имя en_us.json внутри). Член читается и разбирается
+    только в задаче — в памяти одновременно лишь те словари, что сейчас
+    переводятся, а не вся папка mods/. Нечитаемый JSON — False (пропуск).
+    """
+    jar_path, member = src
+    try:
+        with zipfile.ZipFile(jar_path, "r") as zf:
+            # bytes сразу в парсер (orjson), без decode в str
+            data = json_fast.loads(zf.read(member))
+    except Exception:
+        return False
+    lang_json.translate_lang_obj(data, dst, translator)
+    return True
+
+
+def _run_group(group: list, translator) -> int:
+    """Задачи с одним dst — по порядку обхода (последний источник побеждает)."""
+    done = 0
+    for func, src, dst, msg in group:
+        try:
+            if func(src, dst, translator) is False:
+                continue
+        except Exception as e:
+            print(f"[ERR] {dst}: {e}")
+            continue
+        done += 1
+        print(msg)
+    return done
+
+
+def _run_tasks(tasks: list, translator) -> int:
+    """
+    Выполняет собранные задачи в пуле (config.MAX_WORKERS_FILES). Несколько
+    источников могут писать один dst (одинаковый modid в разных jar) — такие
+    идут одной группой последовательно, как в прежнем однопоточном обходе.
+    """
+    groups: dict = {}
+    for t in tasks:
+        groups.setdefault(t[2], []).append(t)
+
+    processed = 0
+    with ThreadPoolExecutor(max_workers=getattr(config, "MAX_WORKERS_FILES", 6)) as ex:
+        futs = [ex.submit(_run_group, g, translator) for g in groups.values()]
+        for f in as_completed(futs):
+            processed += f.result()
     return processed
 
 
@@ -94,10 +132,10 @@ def build_resource_pack(base_input: str, out_root: str, translator) -> None:
         }
     }
     ensure_dir_for_file(os.path.join(out_root, "pack.mcmeta"))
-    with open(os.path.join(out_root, "pack.mcmeta"), "w", encoding="utf-8") as f:
-        json.dump(mcmeta, f, ensure_ascii=False, indent=2)
+    json_fast.dump_path(os.path.join(out_root, "pack.mcmeta"), mcmeta)
 
-    processed = 0
+    # (функция, источник, dst, сообщение) — сначала собираем, потом пулом
+    tasks: list = []
 
     # --- 1) mods/*.jar: assets/*/lang/en_us.json ---
     mods_dir = os.path.join(base_input, "mods")
@@ -108,22 +146,13 @@ def build_resource_pack(base_input: str, out_root: str, translator) -> None:
             jar_path = os.path.join(mods_dir, name)
             try:
                 with zipfile.ZipFile(jar_path, "r") as zf:
-                    for info in zf.infolist():
-                        p = info.filename.replace("\\", "/")
-                        if "/assets/" in p and p.endswith("/lang/en_us.json"):
-                            parts = p.split("/")
-                            try:
-                                modid = parts[parts.index("assets") + 1]
-                            except Exception:
-                                modid = "unknown_mod"
-                            try:
-                                data = json.loads(zf.read(p).decode("utf-8"))
-                            except Exception:
-                                continue
-                            dst = os.path.join(out_root, "assets", modid, "lang", f"{config.TARGET_LANG}.json")
-                            lang_json.translate_lang_obj(data, dst, translator)
-                            processed += 1
-                            print(f"[OK] {modid} → {dst}")
+                    for name in zf.namelist():
+                        m = _LANG_IN_JAR.search(name.replace("\\", "/"))
+                        if not m:
+                            continue
+                        modid = m.group(1)
+                        dst = os.path.join(out_root, "assets", modid, "lang", f"{config.TARGET_LANG}.json")
+                        tasks.append((_translate_jar_member, (jar_path, name), dst, f"[OK] {modid} → {dst}"))
             except zipfile.BadZipFile:
                 continue
 
@@ -141,30 +170,25 @@ def build_resource_pack(base_input: str, out_root: str, translator) -> None:
                     except Exception:
                         modid = "kubejs"
                     dst = os.path.join(out_root, "assets", modid, "lang", f"{config.TARGET_LANG}.json")
-                    lang_json.translate_lang_json(src_path, dst, translator)
-                    processed += 1
-                    print(f"[OK] kubejs:{modid} → {dst}")
+                    tasks.append((lang_json.translate_lang_json, src_path, dst, f"[OK] kubejs:{modid} → {dst}"))
 
     # --- 3-4) assets/ в корне сборки ---
     assets_dir = os.path.join(base_input, "assets")
-    processed = _scan_patchouli_in_assets(assets_dir, out_root, translator, processed)
-    processed = _scan_tips_in_assets(assets_dir, out_root, translator, processed)
-    processed = _scan_lang_in_assets(assets_dir, out_root, translator, processed)
+    _scan_assets(assets_dir, out_root, tasks)
 
     # --- 5) assets/ внутри OpenLoader: config/openloader/resources/**/assets ---
     ol_root = os.path.join(base_input, "config", "openloader", "resources")
     if os.path.isdir(ol_root):
         for root, dirs, _ in os.walk(ol_root):
             if os.path.basename(root) == "assets":
-                processed = _scan_patchouli_in_assets(root, out_root, translator, processed)
-                processed = _scan_tips_in_assets(root, out_root, translator, processed)
-                processed = _scan_lang_in_assets(root, out_root, translator, processed)
+                _scan_assets(root, out_root, tasks)
 
     # --- 6) assets/ внутри overrides/kubejs: overrides/kubejs/assets ---
     overrides_kube_assets = os.path.join(base_input, "overrides", "kubejs", "assets")
-    processed = _scan_patchouli_in_assets(overrides_kube_assets, out_root, translator, processed)
-    processed = _scan_tips_in_assets(overrides_kube_assets, out_root, translator, processed)
-    processed = _scan_lang_in_assets(overrides_kube_assets, out_root, translator, processed)
+    _scan_assets(overrides_kube_assets, out_root, tasks)
+
+    # --- перевод: источники независимы, ждут переводчика — пулом потоков ---
+    processed = _run_tasks(tasks, translator)
 
     # гарантируем финальную запись дебаунс-кэша (R-6)
     try:
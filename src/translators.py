@@ -1,64 +1,119 @@
 # src/translators.py
 from __future__ import annotations
 
-import json
 import re
 import time
 import random
 import urllib.error
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Optional, List, Tuple, Dict
 
 from .utils.cache import TranslationCache
-from .llm.base import LLMClient, RateLimitError
+from .utils import json_fast
+from .utils.regexes import (
+    LATIN as _LATIN,
+    RE_CYR,
+    RE_NAMESPACE,
+    RE_TOKENS,
+)
+from .llm.base import LLMClient, RateLimitError, ServerError
 from . import config
 
-# -------- защитные регекспы --------
-RE_PLACEHOLDER = re.compile(
-    r"%(?:\d+\$)?-?\d*(?:\.\d+)?[sdifx]|"   # %s, %1$s, %02d
-    r"\{[\w\.]+\}"                          # {count}, {0}, {player.name}
-)
-RE_NAMESPACE = re.compile(r"[A-Za-z0-9_.-]+:[A-Za-z0-9_/.-]+")
-RE_LATIN = re.compile(r"[A-Za-z]")
-RE_CYR   = re.compile(r"[А-Яа-яЁё]")
+# -------- защитные регекспы (общие — в utils/regexes.py) --------
+# маркер замаскированного ID в шаблонном ключе кэша (CACHE_TEMPLATE_KEYS);
+# сам попадает под RE_PLACEHOLDER — перевод шаблона проверяется как обычно
+RE_MASK = re.compile(r"\{__(\d+)\}")
+# открывающая markdown-ограда ответа модели: ``` / ```json / ```JSON
+RE_JSON_FENCE = re.compile(r"`{3,}\s*(?:json)?", re.IGNORECASE)
 
 
 def _extract_tokens(s: str) -> Tuple[str, ...]:
     """Достаём плейсхолдеры и namespaced ID из строки."""
     if not s:
         return tuple()
-    toks: List[str] = []
-    toks.extend(RE_PLACEHOLDER.findall(s))
-    toks.extend(RE_NAMESPACE.findall(s))
-    return tuple(sorted(toks))
+    # любому токену нужен хотя бы один из «%», «{», «:» — обычный UI-текст
+    # отсеивается тремя C-поисками, без findall и sorted
+    if "%" not in s and "{" not in s and ":" not in s:
+        return ()
+    return _scan_tokens(s)
+
+
+_find_tokens = RE_TOKENS.findall
+
+
+@lru_cache(maxsize=8192)
+def _scan_tokens(s: str) -> Tuple[str, ...]:
+    """
+    Мемо за префильтром: исходник сканируется и при раскладке, и повторно в
+    translate() после фоллбека пачки; строки без токенов в кэш не попадают.
+    """
+    return tuple(sorted(_find_tokens(s)))
+
+
+def _only_tokens(s: str) -> bool:
+    """
+    Латиница есть только внутри токенов: «minecraft:stone», «%s / {max}»,
+    «%1$s: %2$s» — переводить нечего, запрос к модели не нужен. Общий
+    is_probably_text не годится: он отбрасывает и обычные фразы с «{count}».
+    """
+    return bool(_extract_tokens(s)) and _LATIN.isdisjoint(RE_TOKENS.sub("", s))
+
+
+def _token_heavy(s: str, tokens: Tuple[str, ...], max_count: int, max_mass: float) -> bool:
+    """
+    Строка перегружена токенами — не шлём в модель: их больше max_count или
+    плейсхолдеры («%…», «{…}») занимают больше max_mass её длины. ID в долю не
+    входят: «Use minecraft:stone» — нормальная фраза с длинным ID.
+    """
+    if not tokens:
+        return False
+    if max_count and len(tokens) > max_count:
+        return True
+    if not max_mass:
+        return False
+    mass = sum(len(t) for t in tokens if t[0] in "%{")
+    return mass > max_mass * len(s)
+
+
+def _mask_ids(s: str) -> Tuple[str, Tuple[str, ...]]:
+    """
+    «Use minecraft:stone» → («Use {__0}», ("minecraft:stone",)).
+    Без ID (или если в строке уже есть «{__») — (s, ()).
+    """
+    if ":" not in s or "{__" in s:
+        return s, ()
+    ids: List[str] = []
+
+    def _sub(m: "re.Match[str]") -> str:
+        ids.append(m.group(0))
+        return "{__%d}" % (len(ids) - 1)
+
+    return RE_NAMESPACE.sub(_sub, s), tuple(ids)
+
+
+def _unmask_ids(s: str, ids: Tuple[str, ...]) -> Optional[str]:
+    """Обратная подстановка ID; None, если маркеры потеряны или задвоены."""
+    if sorted(int(n) for n in RE_MASK.findall(s)) != list(range(len(ids))):
+        return None
+    return RE_MASK.sub(lambda m: ids[int(m.group(1))], s)
 
 
 def _looks_russian_only(s: str) -> bool:
     """Строка уже полностью на кириллице (и без латиницы)."""
-    return bool(RE_CYR.search(s)) and not RE_LATIN.search(s)
+    return bool(RE_CYR.search(s)) and _LATIN.isdisjoint(s)
 
 
 def _has_latin(s: str) -> bool:
-    return bool(RE_LATIN.search(s))
+    return not _LATIN.isdisjoint(s)
 
 
 def _lang_name_from_mc_code(code: str) -> str:
     """
-    Небольшой маппер для человекочитаемого языка в подсказке модели.
-    ru_ru -> Russian, de_de -> German и т.п.
-    Если не знаем — возвращаем сам код.
+    Человекочитаемое имя языка для подсказки модели: ru_ru -> Russian и т.п.
+    Таблица одна — config.MC_LANG_NAMES. Если не знаем — возвращаем сам код.
     """
-    m = code.lower()
-    mapping = {
-        "ru_ru": "Russian",
-        "en_us": "English",
-        "de_de": "German",
-        "fr_fr": "French",
-        "es_es": "Spanish",
-        "pt_br": "Brazilian Portuguese",
-        "zh_cn": "Simplified Chinese",
-        "ja_jp": "Japanese",
-    }
-    return mapping.get(m, code)
+    return config.lang_name(code)
 
 
 def _coerce_json_array(raw: str, expected_len: int) -> List[str]:
@@ -69,17 +124,15 @@ def _coerce_json_array(raw: str, expected_len: int) -> List[str]:
     """
     txt = raw.strip()
 
-    # убираем markdown-ограды
-    if txt.startswith("```"):
-        # типа ```json\n[ ... ]\n```
-        txt = txt.strip("`").strip()
-        # могли остаться префиксы 'json' / 'JSON'
-        if txt.lower().startswith("json"):
-            txt = txt[4:].lstrip()
+    # убираем markdown-ограды: открывающую ```json — одной регуляркой (без
+    # lower() копии всего ответа), закрывающей может и не быть
+    m = RE_JSON_FENCE.match(txt)
+    if m:
+        txt = txt[m.end():].rstrip("`").strip()
 
     # пробуем как есть
     try:
-        arr = json.loads(txt)
+        arr = json_fast.loads(txt)
         if isinstance(arr, list) and (expected_len == 0 or len(arr) == expected_len):
             return [str(x) for x in arr]
     except Exception:
@@ -91,7 +144,7 @@ def _coerce_json_array(raw: str, expected_len: int) -> List[str]:
     if start != -1 and end != -1 and end > start:
         core = txt[start : end + 1]
         try:
-            arr = json.loads(core)
+            arr = json_fast.loads(core)
             if isinstance(arr, list) and (expected_len == 0 or len(arr) == expected_len):
                 return [str(x) for x in arr]
         except Exception:
@@ -140,7 +193,10 @@ BATCH_SYSTEM_PROMPT_TEMPLATE = (
 )
 
 
+@lru_cache(maxsize=64)
 def _render_prompt(template: str, target_lang: str) -> str:
+    # шаблоны — константы модуля, target_lang в прогоне один: строка
+    # собирается один раз, дальше запросы берут тот же объект
     lang_name = _lang_name_from_mc_code(target_lang)
     return template.replace("__LANG_NAME__", lang_name).replace("__LANG_CODE__", target_lang)
 
@@ -158,6 +214,28 @@ def _is_complex_text(t: str, threshold: int) -> bool:
     )
 
 
+def _chunk_by_budget(texts: List[str], max_items: int, max_chars: int) -> List[List[str]]:
+    """
+    Жадная нарезка на пачки: не больше max_items строк и max_chars символов
+    (с +3 на кавычки и запятую JSON-массива). Короткие строки идут пачками
+    по max_items, длинные — меньшими, но не упираются в лимит токенов.
+    Строка длиннее бюджета идёт пачкой из одной.
+    """
+    chunks: List[List[str]] = []
+    cur: List[str] = []
+    size = 0
+    for t in texts:
+        cost = len(t) + 3
+        if cur and (len(cur) >= max_items or size + cost > max_chars):
+            chunks.append(cur)
+            cur, size = [], 0
+        cur.append(t)
+        size += cost
+    if cur:
+        chunks.append(cur)
+    return chunks
+
+
 class Translator:
     """
     Переводчик с кэшем, строгой валидацией, ретраями и устойчивой batch-системой.
@@ -187,6 +265,9 @@ class Translator:
         self.strict = strict
         self._log = log or print
         self._warned_complex_fallback = False
+        # окончательные сбои запросов (сеть/лимит) — строка вернулась исходником;
+        # по приросту счётчика вызывающий понимает, что результат неполный
+        self.failures = 0
 
         # Параметры ретраев и batch-а
         self.max_attempts = int(getattr(config, "RETRY_MAX_ATTEMPTS", 6))
@@ -194,7 +275,12 @@ class Translator:
         self.max_delay    = float(getattr(config, "RETRY_MAX_DELAY", 30.0))
         self.jitter       = float(getattr(config, "RETRY_JITTER", 0.25))
         self.cache_fallbacks = bool(getattr(config, "CACHE_FALLBACKS", True))
+        self.template_keys = bool(getattr(config, "CACHE_TEMPLATE_KEYS", False))
+        self.token_max_count = int(getattr(config, "TOKEN_MAX_COUNT", 8))
+        self.token_max_mass = float(getattr(config, "TOKEN_MAX_MASS", 0.6))
         self.batch_size   = int(getattr(config, "BATCH_SIZE", 50))
+        self.batch_max_chars = int(getattr(config, "BATCH_MAX_CHARS", 6000))
+        self.batch_workers = max(1, int(getattr(config, "MAX_WORKERS_BATCHES", 4)))
 
         # Порог "сложной" строки — такие лучше гонять одиночками
         self.complex_len_threshold = int(getattr(config, "COMPLEX_TEXT_THRESHOLD", 220))
@@ -204,6 +290,15 @@ class Translator:
         except Exception:
             pass
 
+    @property
+    def backend_id(self) -> str:
+        """
+        «Чем переводим»: клиенты (провайдер + модель) и strict — для
+        постоянных кэшей результатов целиком (jar_lang), чтобы перевод одной
+        модели не подставлялся при работе с другой.
+        """
+        return f"{self.client.name}|{self._complex_client.name}|strict={self.strict}"
+
     @property
     def hybrid(self) -> bool:
         """True, если сложные строки уходят на отдельный (мощный/внешний) клиент."""
@@ -243,16 +338,13 @@ class Translator:
         - пропускаем уже русские строки
         - пропускаем строки без латиницы (только цифры/символы/плейсхолдеры)
         - используем кэш (с учётом целевого языка — R-3)
-        - при ошибке сети / лимита — оставляем исходник
+        - при ошибке сети / лимита — оставляем исходник (в кэш не пишем)
         """
         if not text:
             return text
 
-        # уже русский без латиницы → не трогаем
-        if _looks_russian_only(text):
-            return text
-
-        # нет латиницы вообще — тоже не трогаем (например, чистые числа или id без букв)
+        # нет латиницы — не трогаем: уже русский текст (_looks_russian_only —
+        # частный случай), чистые числа, id без букв; один поиск вместо трёх
         if not _has_latin(text):
             return text
 
@@ -260,12 +352,20 @@ class Translator:
         if cached is not None:
             return cached
 
+        if _only_tokens(text):  # модели перевести нечего (ID/плейсхолдеры)
+            return text
+
         # если клиент не задан явно — выбираем по сложности строки (STEP 5)
         use_client = client or self._pick_client(text)
         src_tokens = _extract_tokens(text)
-        out = self._retry_call(lambda: self._request_single(text, target_lang, use_client))
+        if _token_heavy(text, src_tokens, self.token_max_count, self.token_max_mass):
+            return text
+        out = self._retry_call(self._request_single, text, target_lang, use_client)
         if out is None:
-            out = text  # при окончательной неудаче — исходник
+            # окончательная неудача (сеть/лимит) — исходник, но НЕ в кэш:
+            # иначе сбой навсегда «переведёт» строку в неё саму
+            self.failures += 1
+            return text
 
         # проверка плейсхолдеров
         dst_tokens = _extract_tokens(out)
@@ -293,87 +393,154 @@ class Translator:
 
         uniq_map: Dict[str, List[int]] = {}
         src_tokens_ref: Dict[str, Tuple[str, ...]] = {}
+        # позиция → замаскированные ID (строка ушла в batch шаблоном)
+        masked: Dict[int, Tuple[str, ...]] = {}
+
+        # локальные ссылки: цикл идёт по каждой строке файла, без повторных
+        # поисков атрибутов и глобалов на итерации
+        no_latin = _LATIN.isdisjoint
+        cache_get = self.cache.view(target_lang).get
+        threshold = self.complex_len_threshold
+        template_keys = self.template_keys
+        max_count, max_mass = self.token_max_count, self.token_max_mass
 
         for i, t in enumerate(texts):
             if not t:
                 results[i] = t
                 continue
 
-            # уже русский и без латиницы
-            if _looks_russian_only(t) or not _has_latin(t):
+            # без латиницы (в т.ч. уже русский) — как есть
+            if no_latin(t):
                 results[i] = t
                 continue
 
             # кэш
-            c = self.cache.get(t, target_lang)
+            c = cache_get(t)
             if c is not None:
                 results[i] = c
                 continue
 
+            if _only_tokens(t):  # одни ID/плейсхолдеры — как есть
+                results[i] = t
+                continue
+
             # сложные строки — одиночками; translate() сам сроутит их на
             # complex/standard-клиент (или на light с пометкой, если его нет).
-            if _is_complex_text(t, self.complex_len_threshold):
+            if _is_complex_text(t, threshold):
                 results[i] = self.translate(t, target_lang)
                 continue
 
+            # шаблонный ключ: тот же текст с другими ID уже переведён?
+            ids = ()
+            if template_keys:
+                tpl, ids = _mask_ids(t)
+                if ids:
+                    c = cache_get(tpl)
+                    if c is not None:
+                        c = _unmask_ids(c, ids)
+                        if c is not None:
+                            results[i] = c
+                            continue
+                    # допуск — по исходнику: маркеры {__N} шаблона сошли бы
+                    # за плейсхолдеры, а ID в долю не входят
+                    if _token_heavy(t, _extract_tokens(t), max_count, max_mass):
+                        results[i] = t
+                        continue
+                    masked[i] = ids
+                    t = tpl
+
             # идёт в batch
-            if t not in uniq_map:
-                uniq_map[t] = []
-                src_tokens_ref[t] = _extract_tokens(t)
-            uniq_map[t].append(i)
+            positions = uniq_map.get(t)
+            if positions is None:
+                toks = _extract_tokens(t)
+                if not ids and _token_heavy(t, toks, max_count, max_mass):
+                    results[i] = t
+                    continue
+                uniq_map[t] = positions = []
+                src_tokens_ref[t] = toks
+            positions.append(i)
 
         # если всё уже обработано кэшем/одиночками
         if not uniq_map:
             return [r if r is not None else "" for r in results]
 
-        uniq_texts = list(uniq_map.keys())
+        # похожие строки — в одну пачку: одинаковый набор плейсхолдеров и
+        # близкая длина (корзины по 32 символа) — ровнее пачки по бюджету
+        # символов и однороднее ответ; раскладка обратно идёт по ключу
+        uniq_texts = sorted(uniq_map, key=lambda u: (src_tokens_ref[u], len(u) >> 5))
         outputs_for_uniq: Dict[str, str] = {}
+        chunks = _chunk_by_budget(uniq_texts, max(1, self.batch_size), self.batch_max_chars)
+        del uniq_texts
 
-        for off in range(0, len(uniq_texts), self.batch_size):
-            chunk = uniq_texts[off : off + self.batch_size]
-
-            # попытка батч-запроса с ретраями (массовые строки → основной client)
-            try:
-                translated_chunk = self._retry_call(
-                    lambda: self._request_batch(chunk, target_lang, self.client)
-                )
-            except Exception as e:
-                print(f"[BatchFatal] {e} → fallback to single for this chunk")
-                translated_chunk = None
-
-            # если батч сломался — одиночками
-            if translated_chunk is None or len(translated_chunk) != len(chunk):
-                translated_chunk = [self.translate(t, target_lang) for t in chunk]
-
-            # валидация плейсхолдеров + кэш
+        def _apply(chunk: List[str], result: Tuple[List[str], bool]) -> None:
+            # валидация плейсхолдеров + кэш; одиночный фоллбек translate() свои
+            # удачи уже закэшировал, а сбои кэшировать нельзя — пропускаем
+            translated_chunk, batched = result
             for src, out in zip(chunk, translated_chunk):
-                want = src_tokens_ref[src]
+                want = src_tokens_ref.pop(src)  # больше не нужен — отпускаем
                 got  = _extract_tokens(out)
                 if want != got and self.strict:
                     out = src
                 outputs_for_uniq[src] = out
-                if out != src or self.cache_fallbacks:
+                if batched and (out != src or self.cache_fallbacks):
                     self.cache.put(src, out, target_lang)
 
             # периодически сохраняем кэш (дебаунс внутри cache.save)
             self.cache.save()
 
-        # разбрасываем по исходным индексам
+        # пачки независимы и почти всё время ждут сеть/сервер — несколько
+        # сразу; валидация и запись в кэш — здесь, в вызывающем потоке
+        workers = min(self.batch_workers, len(chunks))
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as ex:
+                futs = {ex.submit(self._translate_chunk, c, target_lang): c for c in chunks}
+                chunks.clear()  # пачка живёт, пока не применена (futs.pop)
+                for f in as_completed(futs):
+                    _apply(futs.pop(f), f.result())
+        else:
+            for chunk in chunks:
+                _apply(chunk, self._translate_chunk(chunk, target_lang))
+
+        # разбрасываем по исходным индексам; промежуточные словари опустошаем
+        # по ходу — на больших паках не держим две копии ссылок до return
         for src, positions in uniq_map.items():
-            out = outputs_for_uniq.get(src, src)
+            out = outputs_for_uniq.pop(src, src)
             for i in positions:
-                results[i] = out
+                ids = masked.get(i)
+                if ids is None:
+                    results[i] = out
+                else:
+                    res = _unmask_ids(out, ids)
+                    results[i] = texts[i] if res is None else res
 
         return [r if r is not None else "" for r in results]
 
+    def _translate_chunk(self, chunk: List[str], target_lang: str) -> Tuple[List[str], bool]:
+        """
+        Одна пачка: batch-запрос с ретраями, при сбое — одиночками.
+        Второй элемент — False, если пачка ушла в одиночный фоллбек.
+        """
+        # попытка батч-запроса с ретраями (массовые строки → основной client)
+        try:
+            translated_chunk = self._retry_call(self._request_batch, chunk, target_lang, self.client)
+        except Exception as e:
+            print(f"[BatchFatal] {e} → fallback to single for this chunk")
+            translated_chunk = None
+
+        # если батч сломался — одиночками
+        if translated_chunk is None or len(translated_chunk) != len(chunk):
+            return [self.translate(t, target_lang) for t in chunk], False
+        return translated_chunk, True
+
     # ---------- механизм ретраев ----------
-    def _retry_call(self, func):
+    def _retry_call(self, func, *args, **kwargs):
+        """func(*args, **kwargs) с ретраями сетевых/429-ошибок (без замыкания на вызов)."""
         attempts = 0
         last_err: Optional[Exception] = None
         while attempts < self.max_attempts:
             attempts += 1
             try:
-                return func()
+                return func(*args, **kwargs)
             except Exception as e:
                 last_err = e
                 msg = str(e).lower()
@@ -383,13 +550,18 @@ class Translator:
                     or ("too many requests" in msg)
                     or ("rate limit" in msg)
                 )
-                is_net = isinstance(e, (urllib.error.URLError, TimeoutError))
+                is_net = isinstance(e, (urllib.error.URLError, TimeoutError, ServerError))
                 if not (is_rate or is_net):
                     # логическая/парсинговая ошибка — не мучаемся ретраями
                     break
                 delay = min(self.max_delay, self.base_delay * (2 ** (attempts - 1)))
                 delay *= 1.0 + random.uniform(-self.jitter, self.jitter)
                 delay = max(0.0, delay)
+                # сервер сам сказал, сколько ждать (Retry-After) — не раньше,
+                # но и не дольше max_delay
+                retry_after = getattr(e, "retry_after", None)
+                if retry_after is not None:
+                    delay = max(delay, min(float(retry_after), self.max_delay))
                 print(f"[Retry] attempt {attempts}/{self.max_attempts}, sleep {delay:.1f}s, err={e}")
                 time.sleep(delay)
         if last_err:
@@ -415,7 +587,9 @@ class Translator:
         return out.strip()
 
     def _request_batch(self, texts: List[str], target_lang: str, client: LLMClient) -> List[str]:
-        user_content = json.dumps(texts, ensure_ascii=False)
+        # компактный массив (без ", "): меньше байт и токенов; тело запроса
+        # целиком сериализует клиент, уже без ensure_ascii (json_fast.dumps)
+        user_content = json_fast.dumps(texts).decode("utf-8")
         messages = [
             {"role": "system", "content": self._batch_system_prompt(target_lang)},
             {"role": "user", "content": user_content},
@@ -2,11 +2,12 @@
 from __future__ import annotations
 
 import atexit
-import json
 import os
 import threading
 import time
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
+
+from . import json_fast
 
 
 class TranslationCache:
@@ -22,6 +23,11 @@ class TranslationCache:
     R-6: save() дебаунсится (не переписывает файл после каждой строки);
          реальная запись раз в `save_interval` секунд ИЛИ раз в `save_every`
          изменений. Финальная запись гарантируется flush() и atexit.
+
+    Запись инкрементальная: новые пары дописываются в журнал `<path>.journal`
+    (JSONL, строка {"l","k","v"}), сам JSON переписывается целиком только при
+    компакции — когда в журнале строк больше, чем записей в кэше (и > 1000). load()
+    читает снимок и проигрывает журнал поверх.
     """
 
     # язык по умолчанию для миграции старого «плоского» кэша
@@ -47,6 +53,12 @@ class TranslationCache:
         self._dirty = 0
         self._last_save = 0.0
 
+        # журнал дописываемых изменений (см. docstring класса)
+        self._journal_path = f"{path}.journal" if path else ""
+        self._pending: List[Tuple[str, str, str]] = []
+        self._journal_lines = 0
+        self._journal_torn = False  # последняя строка журнала без «\n»
+
         # финальный флеш на выходе процесса
         atexit.register(self.flush)
 
@@ -58,13 +70,36 @@ class TranslationCache:
                 return
             if self.path and os.path.exists(self.path):
                 try:
-                    with open(self.path, "r", encoding="utf-8") as f:
-                        raw = json.load(f)
+                    raw = json_fast.load_path(self.path)
                     self._data = self._normalize_loaded(raw)
                 except Exception:
                     self._data = {}
+            self._replay_journal()
             self._loaded = True
 
+    def _replay_journal(self) -> None:
+        """Проиграть журнал поверх снимка; битую (недописанную) строку — пропускаем."""
+        if not self._journal_path or not os.path.exists(self._journal_path):
+            return
+        n = 0
+        line = b""
+        try:
+            # bytes, а не текст: обрыв посреди многобайтного символа (кириллица)
+            # в текстовом режиме бросил бы UnicodeDecodeError из самого
+            # итератора файла и сорвал бы весь load()
+            with open(self._journal_path, "rb") as f:
+                for line in f:
+                    try:
+                        row = json_fast.loads(line.decode("utf-8"))
+                        self._data.setdefault(str(row["l"]), {})[str(row["k"])] = str(row["v"])
+                    except (UnicodeDecodeError, ValueError, KeyError, TypeError):
+                        continue
+                    n += 1
+        except OSError:
+            return
+        self._journal_lines = n
+        self._journal_torn = bool(line) and not line.endswith(b"\n")
+
     def _normalize_loaded(self, raw) -> Dict[str, Dict[str, str]]:
         """
         Приводим содержимое файла к формату {lang: {src: dst}}.
@@ -89,17 +124,46 @@ class TranslationCache:
         return {default_lang: {str(k): str(v) for k, v in raw.items()}}
 
     def _write(self) -> None:
-        """Физическая запись на диск (под замком)."""
+        """Запись изменений (под замком): дописать журнал или компактировать."""
         if not self.path:
+            self._pending.clear()
+            self._dirty = 0
             return
-        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
-        tmp = f"{self.path}.tmp"
-        with open(tmp, "w", encoding="utf-8") as f:
-            json.dump(self._data, f, ensure_ascii=False, indent=2)
-        os.replace(tmp, self.path)  # атомарная замена
+        if self._journal_lines + len(self._pending) > max(1000, len(self)):
+            self._compact()
+        else:
+            self._append_journal()
         self._dirty = 0
         self._last_save = time.time()
 
+    def _append_journal(self) -> None:
+        """O(изменений): дописать накопленные пары одной записью в журнал."""
+        if not self._pending:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        dumps = json_fast.dumps
+        chunk = b"".join(dumps({"l": l, "k": k, "v": v}) + b"\n" for l, k, v in self._pending)
+        if self._journal_torn:  # не склеиваем новую строку с оборванной
+            chunk = b"\n" + chunk
+            self._journal_torn = False
+        with open(self._journal_path, "ab") as f:
+            f.write(chunk)
+        self._journal_lines += len(self._pending)
+        self._pending.clear()
+
+    def _compact(self) -> None:
+        """Полный снимок JSON (атомарно), после него журнал не нужен."""
+        # json_fast: orjson с отступом 2 (stdlib-фоллбек), запись через tmp + os.replace
+        json_fast.dump_path(self.path, self._data)
+        # снимок уже содержит всё из журнала: удаляем его ПОСЛЕ замены
+        try:
+            os.remove(self._journal_path)
+        except FileNotFoundError:
+            pass
+        self._journal_lines = 0
+        self._journal_torn = False
+        self._pending.clear()
+
     def save(self, force: bool = False) -> None:
         """
         Дебаунс-сохранение (R-6).
@@ -128,14 +192,28 @@ class TranslationCache:
 
     # ---- интерфейс для работы ----
     def get(self, src: str, lang: str = _DEFAULT_LANG) -> Optional[str]:
-        """Вернуть перевод по (исходная строка, целевой язык) или None."""
+        """
+        Вернуть перевод по (исходная строка, целевой язык) или None.
+        Без замка: чтение dict атомарно под GIL, а put() только добавляет
+        ключи — читатели из воркеров не ждут писателей и сохранение на диск.
+        """
+        m = self._data.get(lang)
+        return None if m is None else m.get(src)
+
+    def view(self, lang: str = _DEFAULT_LANG) -> Dict[str, str]:
+        """
+        Живой словарь {src: dst} для языка — для горячих циклов чтения без
+        замка на каждую строку (dict.get атомарен под GIL). put() пишет в
+        этот же словарь, так что вид не устаревает.
+        """
         with self._lock:
-            return self._data.get(lang, {}).get(src)
+            return self._data.setdefault(lang, {})
 
     def put(self, src: str, dst: str, lang: str = _DEFAULT_LANG) -> None:
         """Сохранить перевод в память (в намспейс целевого языка)."""
         with self._lock:
             self._data.setdefault(lang, {})[src] = dst
+            self._pending.append((lang, src, dst))
             self._dirty += 1
 
     def __len__(self) -> int:
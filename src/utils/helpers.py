@@ -1,36 +1,118 @@
 # src/utils/helpers.py
 import os
 import re
+import sys
 import json
+import threading
+from functools import lru_cache
 
+from .regexes import LATIN as _LATIN, RE_HEAVY_SYMBOLS, RE_NAMESPACE_TEXT
+
+
+# --- Каталог пользовательских файлов (secrets.json и т.п.) ---
+@lru_cache(maxsize=1)
+def base_dir_for_user_files() -> str:
+    """Папка рядом с exe (frozen) или корень проекта. Считается один раз."""
+    if getattr(sys, "frozen", False):
+        return os.path.dirname(sys.executable)
+    # src/utils/helpers.py → корень проекта на два уровня выше src/
+    return os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 
-# --- Проверка, что строка похожа на текст ---
-RE_NAMESPACE = re.compile(r"[A-Za-z0-9_.-]+:[A-Za-z0-9_.-]+")   # modid:item, namespace:key
-RE_PLACEHOLDER = re.compile(r"%[sdifx]|%\d*\$[sdifx]|\{[\w\.]+\}")  # %s, %1$s, {count}, {player}
-RE_HEAVY_SYMBOLS = re.compile(r"[{}<>$%^\\\[\]|`~]")
-RE_LATIN = re.compile(r"[A-Za-z]")
 
+# --- Проверка, что строка похожа на текст ---
 def is_probably_text(s: str, max_len: int = 800) -> bool:
     """Возвращает True, если строка похожа на обычный текст, который стоит перевести."""
     if not isinstance(s, str) or not s:
         return False
     if len(s) > max_len:
         return False
-    if not RE_LATIN.search(s):  # нет латиницы — не похоже на английский текст
+    # проверки по возрастанию цены; isdisjoint — C-цикл без regex-движка
+    if _LATIN.isdisjoint(s):  # нет латиницы — не похоже на английский текст
         return False
     if RE_HEAVY_SYMBOLS.search(s):
         return False
-    if RE_NAMESPACE.search(s):  # modid:item → не трогаем
+    # modid:item → не трогаем; без «:» ID не бывает, а поиск RE_NAMESPACE_TEXT по
+    # обычной фразе — самая дорогая часть функции
+    if ":" in s and RE_NAMESPACE_TEXT.search(s):
         return False
     return True
 
 
+# --- Экранирование строковых литералов SNBT / JS ---
+# escape: один проход str.translate вместо цепочки replace;
+# unescape: одна регулярка «\x» → «x» для x ∈ {\, кавычка}.
+_ESC_DQ = str.maketrans({"\\": "\\\\", '"': '\\"'})
+_ESC_SQ = str.maketrans({"\\": "\\\\", "'": "\\'"})
+_UNESC_DQ_RE = re.compile(r'\\([\\"])')
+_UNESC_SQ_RE = re.compile(r"\\([\\'])")
+
+
+def escape_quoted(s: str, quote: str) -> str:
+    """Экранирует «\\» и кавычку для литерала в кавычках quote (" или ')."""
+    return s.translate(_ESC_DQ if quote == '"' else _ESC_SQ)
+
+
+def unescape_quoted(s: str, quote: str) -> str:
+    """Обратное к escape_quoted: «\\\\» → «\\», «\\<quote>» → «<quote>»."""
+    if "\\" not in s:
+        return s
+    return (_UNESC_DQ_RE if quote == '"' else _UNESC_SQ_RE).sub(r"\1", s)
+
+
 # --- Безопасное создание директорий для файла ---
 def ensure_dir_for_file(path: str):
     """Создаёт директории для указанного пути, если их ещё нет."""
     os.makedirs(os.path.dirname(path), exist_ok=True)
 
 
+# --- Быстрое чтение/запись текста (один decode/encode вместо TextIOWrapper) ---
+def read_text_lf(path: str) -> str:
+    """
+    Читает UTF-8 файл целиком bytes → str одним decode. Переводы строк
+    приводятся к «\n», как у текстового режима (universal newlines).
+    """
+    with open(path, "rb") as f:
+        text = f.read().decode("utf-8")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def write_text_lf(path: str, text: str) -> None:
+    """Пишет str одним encode в bytes (без перевода «\n» в CRLF), атомарно."""
+    atomic_write_bytes(path, text.encode("utf-8"))
+
+
+# --- Атомарная запись ---
+def atomic_write_bytes(path: str, data: bytes) -> None:
+    """
+    Пишет во временный файл рядом с целевым и подменяет его через os.replace:
+    при падении посреди записи старый файл остаётся целым (а не обрезанным).
+    Имя временного файла уникально на процесс и поток (параллельные воркеры).
+    fsync не делаем: целостность обеспечивает rename, а синхронный сброс на
+    каждый из тысяч мелких файлов только тормозит прогон.
+    """
+    d = os.path.dirname(path)
+    if d:
+        os.makedirs(d, exist_ok=True)
+    tmp = f"{path}.tmp.{os.getpid()}.{threading.get_ident()}"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def atomic_write_text(path: str, text: str, encoding: str = "utf-8") -> None:
+    """atomic_write_bytes для текста (переводы строк — как есть, «\n»)."""
+    atomic_write_bytes(path, text.encode(encoding))
+
+
 # --- Работа с JSON ---
 def read_json(path: str) -> dict:
     """Безопасное чтение JSON."""
@@ -0,0 +1,116 @@
+# src/utils/json_fast.py
+# Быстрый JSON: orjson (если установлен) с чистым stdlib-фоллбеком.
+# orjson разбирает bytes напрямую (без отдельного decode) и в разы быстрее
+# stdlib на больших lang/patchouli-файлах. Зависимость опциональная.
+from __future__ import annotations
+
+import json
+from typing import Any, Iterator, Union
+
+from .helpers import atomic_write_bytes
+
+try:
+    import orjson  # type: ignore
+except Exception:  # нет orjson — работаем на stdlib
+    orjson = None
+
+try:
+    import ijson  # type: ignore  # потоковый разбор для dry-run
+except Exception:
+    ijson = None
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """json.loads, принимающий str или bytes (UTF-8)."""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # NaN/Infinity, целые > 64 бит и т.п. orjson не принимает, а stdlib —
+            # да; на честно битом JSON stdlib бросит свою ошибку.
+            pass
+    return json.loads(data)
+
+
+def load_path(path: str) -> Any:
+    """Прочитать JSON-файл целиком как bytes и разобрать."""
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+
+def _walk_strings(node: Any) -> Iterator[str]:
+    """
+    Все строки-значения дерева JSON (ключи — нет), в порядке документа.
+    Явный стек вместо рекурсии (глубокие text-компоненты не упираются в
+    recursion limit); type() is — дерево из парсера, там только базовые типы.
+    """
+    stack = [node]
+    pop, push = stack.pop, stack.extend
+    while stack:
+        n = pop()
+        t = type(n)
+        if t is str:
+            yield n
+        elif t is dict:
+            push(reversed(n.values()))
+        elif t is list:
+            push(reversed(n))
+
+
+def iter_strings(path: str) -> Iterator[str]:
+    """
+    Строковые значения JSON-файла на любой глубине.
+
+    С ijson файл разбирается потоково (события "string"), без построения
+    всего дерева — большие lang/patchouli не держат DOM в памяти. Без ijson —
+    обычный load_path + обход.
+    """
+    if ijson is not None:
+        with open(path, "rb") as f:
+            for _, ev, v in ijson.parse(f, use_float=True):
+                if ev == "string":
+                    yield v
+        return
+    yield from _walk_strings(load_path(path))
+
+
+def iter_top_strings(path: str) -> Iterator[str]:
+    """Строковые значения верхнего уровня объекта (формат lang/*.json)."""
+    if ijson is not None:
+        with open(path, "rb") as f:
+            for _, v in ijson.kvitems(f, "", use_float=True):
+                if isinstance(v, str):
+                    yield v
+        return
+    data = load_path(path)
+    if isinstance(data, dict):
+        yield from (v for v in data.values() if isinstance(v, str))
+
+
+def dumps(obj: Any) -> bytes:
+    """Компактный UTF-8 JSON (без пробелов и \\uXXXX) — тела HTTP-запросов."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj)
+        except (TypeError, orjson.JSONEncodeError):
+            pass
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def dumps_pretty(obj: Any) -> bytes:
+    """
+    UTF-8 JSON с отступом 2 и без \\uXXXX-экранирования кириллицы — то же,
+    что json.dump(..., ensure_ascii=False, indent=2). orjson не умеет NaN и
+    целые > 64 бит — на таких данных молча уходим в stdlib.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+        except (TypeError, orjson.JSONEncodeError):
+            pass
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def dump_path(path: str, obj: Any) -> None:
+    """Записать obj в файл (dumps_pretty, переводы строк — «\\n»), атомарно."""
+    atomic_write_bytes(path, dumps_pretty(obj))
@@ -0,0 +1,32 @@
+# src/utils/regexes.py
+# Общие регекспы распознавания текста/токенов — одно место компиляции для
+# translators.py (валидация плейсхолдеров) и helpers.is_probably_text.
+from __future__ import annotations
+
+import re
+import string
+
+# %s, %1$s, %02d, {count}, {0}, {player.name}
+RE_PLACEHOLDER = re.compile(
+    r"%(?:\d+\$)?-?\d*(?:\.\d+)?[sdifx]|"
+    r"\{[\w\.]+\}"
+)
+# modid:item, namespace:path/to/res. (?<!...) — матч начинается только с
+# начала «слова»: без него на длинной серии букв без «:» движок пробует
+# каждую позицию → O(n²); находки те же
+RE_NAMESPACE = re.compile(r"(?<![A-Za-z0-9_.-])[A-Za-z0-9_.-]+:[A-Za-z0-9_/.-]+")
+# для is_probably_text — без «/» справа от «:»: иначе «https://…» в обычной
+# фразе считался бы ID и строка не переводилась бы
+RE_NAMESPACE_TEXT = re.compile(r"(?<![A-Za-z0-9_.-])[A-Za-z0-9_.-]+:[A-Za-z0-9_.-]+")
+# оба набора токенов одной альтернацией — один проход по строке вместо двух
+# findall. Разница с парой регекспов — только в перекрытиях: ID больше не
+# начинается внутри плейсхолдера («%s:foo» → «%s», а не ещё и «s:foo»)
+RE_TOKENS = re.compile(RE_PLACEHOLDER.pattern + "|" + RE_NAMESPACE.pattern)
+# символы разметки/кода — строка с ними не похожа на обычный текст
+RE_HEAVY_SYMBOLS = re.compile(r"[{}<>$%^\\\[\]|`~]")
+RE_LATIN = re.compile(r"[A-Za-z]")
+RE_CYR = re.compile(r"[А-Яа-яЁё]")
+# «есть ли латиница» — LATIN.isdisjoint(s): C-цикл по символам с выходом на
+# первой букве, без запуска regex-движка; на коротком английском UI-тексте в
+# 2–3 раза быстрее RE_LATIN.search
+LATIN = frozenset(string.ascii_letters)